@@ -0,0 +1,256 @@
+# Name: JsonPathExtractor Benchmark
+# Date: 2026-10-18
+# Author: Ais
+# Desc: JsonPathExtractor 的基准测试(索引构建与查询开销)
+
+
+import gc
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import tracemalloc
+
+import jsonpath
+from jsonpath import JsonPathExtractor
+
+
+def gen_document(width, depth, array_length, seed=0):
+    """生成合成文档
+
+    文档结构为 {"data": {"list": [记录, ...]}, "page": {...}}，每条记录是宽度为 width，深度为 depth 的嵌套对象，
+    每层的最后一个字段为数组(长度为 width)，其他叶子值为整数或字符串。
+
+    Args:
+        * width(int): 每层对象的字段数量
+        * depth(int): 记录的嵌套深度
+        * array_length(int): 记录数量
+        * seed(int): 随机数种子
+
+    Returns:
+        (dict) 合成文档
+    """
+    rand = random.Random(seed)
+
+    def record(level):
+        if level >= depth:
+            return rand.choice([rand.randint(0, 1 << 20), f'http://www.test.com/{rand.getrandbits(32):x}'])
+        obj = {f'k{i}': record(level + 1) for i in range(width - 1)}
+        obj["items"] = [rand.randint(0, 100) for _ in range(width)]
+        return obj
+
+    return {
+        "data": {"list": [record(0) for _ in range(array_length)]},
+        "page": {"info": {"page_num": 1, "page_size": array_length}, "isEnd": False},
+    }
+
+
+def gen_queries(width, depth, array_length, seed=0):
+    """生成查询
+
+    Returns:
+        (dict) {"get": 路径列表, "find": 路径表达式列表, "map": 路径表达式映射表}
+    """
+    rand = random.Random(seed)
+    leaf = "".join(f'/k{rand.randrange(max(width - 1, 1))}' for _ in range(depth))
+    gets = [f'/data/list/{rand.randrange(array_length)}{leaf}' for _ in range(100)] if array_length else []
+    finds = [
+        f'/data/list/\\d+{leaf}',
+        "/data/list/\\d+/items/0",
+        "/page/info/.+",
+        "/data/list/.*/items/\\d+",
+    ]
+    jpath_map = {
+        "pn": {"op": "get", "jpath": "/page/info/page_num"},
+        "isEnd": {"op": "get", "jpath": "/page/isEnd", "default": False},
+        "leaves": {"op": "find", "jpath": finds[0]},
+        "items": {"op": "find", "jpath": finds[1]},
+    }
+    return {"get": gets, "find": finds, "map": jpath_map}
+
+
+def measure(func, repeat):
+    """测量函数的执行时间
+
+    Returns:
+        (dict) {"min": 最小耗时, "median": 耗时中位数}(秒)
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times)}
+
+
+def measure_memory(func):
+    """测量函数执行期间的内存峰值(tracemalloc)
+
+    Returns:
+        (int) 内存峰值(字节)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_case(doc, queries, options, repeat):
+    """对单个文档和提取器配置进行基准测试
+
+    Args:
+        * doc(dict): 文档
+        * queries(dict): 查询(详见 gen_queries)
+        * options(dict): JsonPathExtractor 的构造参数
+        * repeat(int): 重复次数
+
+    Returns:
+        (dict) 测试结果
+    """
+    extractor = JsonPathExtractor(doc, **options)
+    gets, finds, jpath_map = queries["get"], queries["find"], queries["map"]
+    return {
+        "build": measure(lambda: JsonPathExtractor(doc, **options), repeat),
+        "build_peak_memory": measure_memory(lambda: JsonPathExtractor(doc, **options)),
+        "index_size": extractor.index_size(),
+        "get": measure(lambda: [extractor.get(jpath) for jpath in gets], repeat),
+        "extract": measure(lambda: [JsonPathExtractor.extract(doc, jpath) for jpath in gets], repeat),
+        "find": {jpath: measure(lambda: extractor.find(jpath), repeat) for jpath in finds},
+        "map": measure(lambda: extractor.map(jpath_map), repeat),
+    }
+
+
+def bench_decode(array_lengths, repeat, seed=0):
+    """对 json 解码器进行基准测试
+
+    对每种规模的文档(宽度为 4，深度为 2)，比较以下解码方式的耗时:
+        * str: 将 bytes 转换为 str 后通过标准库 json 解码(原有的调用方式)
+        * bytes: 通过解码器直接解码 bytes
+        * extractor: 通过 JsonPathExtractor(bytes, decoder=...) 解码(惰性模式，不构建路径索引表)
+
+    Returns:
+        (list) [测试用例结果]
+    """
+    decoders = ["json"] + [name for name in ("orjson", "ujson") if getattr(jsonpath, name) is not None]
+    cases = []
+    for array_length in array_lengths:
+        payload = json.dumps(gen_document(4, 2, array_length, seed), ensure_ascii=False).encode("utf-8")
+        for decoder in decoders:
+            print(f'[benchmark]: decode size={len(payload)} decoder={decoder}', file=sys.stderr)
+            loads = JsonPathExtractor.get_decoder(decoder)
+            cases.append({
+                "decoder": decoder, "array_length": array_length, "size": len(payload),
+                "results": {
+                    "str": measure(lambda: json.loads(payload.decode("utf-8")), repeat),
+                    "bytes": measure(lambda: loads(payload), repeat),
+                    "extractor": measure(lambda: JsonPathExtractor(payload, lazy=True, decoder=decoder), repeat),
+                },
+            })
+    return cases
+
+
+def run(widths, depths, array_lengths, backends, repeat=5, seed=0, decode_array_lengths=()):
+    """运行基准测试
+
+    对 widths, depths, array_lengths 的每种组合生成文档，并分别测试 backends 中的提取器配置，
+    并对 decode_array_lengths 中每种规模的文档测试 json 解码器。
+
+    Returns:
+        (dict) {"env": 运行环境, "cases": [测试用例结果], "decode": [解码器测试结果]}
+    """
+    cases = []
+    for width in widths:
+        for depth in depths:
+            for array_length in array_lengths:
+                doc = gen_document(width, depth, array_length, seed)
+                queries = gen_queries(width, depth, array_length, seed)
+                for backend in backends:
+                    options = json.loads(backend)
+                    print(f'[benchmark]: width={width} depth={depth} array_length={array_length} options={backend}', file=sys.stderr)
+                    cases.append({
+                        "width": width, "depth": depth, "array_length": array_length, "options": options,
+                        "size": len(json.dumps(doc)),
+                        "results": bench_case(doc, queries, options, repeat),
+                    })
+    return {
+        "env": {"python": sys.version.split()[0], "platform": platform.platform(), "repeat": repeat, "seed": seed},
+        "cases": cases,
+        "decode": bench_decode(decode_array_lengths, repeat, seed),
+    }
+
+
+def _flatten(results, prefix=""):
+    """展开测试结果中的指标，返回 {指标名: 值}(耗时取最小值)"""
+    metrics = {}
+    for key, val in results.items():
+        name = f'{prefix}.{key}' if prefix else key
+        if isinstance(val, dict) and "min" in val:
+            metrics[name] = val["min"]
+        elif isinstance(val, dict):
+            metrics.update(_flatten(val, name))
+        else:
+            metrics[name] = val
+    return metrics
+
+
+def compare(baseline, current):
+    """对比两次测试结果，返回 [(用例, 指标名, 基准值, 当前值, 比值)]"""
+    def key(case):
+        if "decoder" in case:
+            return ("decode", case["decoder"], case["array_length"])
+        return (case["width"], case["depth"], case["array_length"], json.dumps(case["options"], sort_keys=True))
+    baseline_cases = {key(case): case for case in baseline["cases"] + baseline.get("decode", [])}
+    rows = []
+    for case in current["cases"] + current["decode"]:
+        base = baseline_cases.get(key(case))
+        if base is None:
+            continue
+        base_metrics = _flatten(base["results"])
+        for name, val in _flatten(case["results"]).items():
+            if name in base_metrics:
+                ratio = val / base_metrics[name] if base_metrics[name] else float("nan")
+                rows.append((key(case), name, base_metrics[name], val, ratio))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmark", description="JsonPathExtractor 基准测试")
+    parser.add_argument("--widths", default="4,8", help="每层对象的字段数量(逗号分隔)")
+    parser.add_argument("--depths", default="2,4", help="记录的嵌套深度(逗号分隔)")
+    parser.add_argument("--array-lengths", default="100,1000", help="记录数量(逗号分隔)")
+    parser.add_argument(
+        "--backends", nargs="+", default=['{}', '{"index_backend": "trie"}', '{"lazy": true}'],
+        help="提取器配置(JsonPathExtractor 构造参数的 json 字符串)"
+    )
+    parser.add_argument("--decode-array-lengths", default="10,100,1000,10000", help="解码器测试的文档记录数量(逗号分隔)，为空时跳过")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    parser.add_argument("-o", "--output", help="测试结果的输出路径(json)，默认输出到标准输出")
+    parser.add_argument("--compare", help="基准测试结果的路径(json)，输出与本次结果的对比")
+    args = parser.parse_args(argv)
+
+    ints = lambda text: [int(val) for val in text.split(",") if val]
+    report = run(
+        ints(args.widths), ints(args.depths), ints(args.array_lengths), args.backends, args.repeat, args.seed,
+        ints(args.decode_array_lengths)
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for case, name, base, val, ratio in compare(baseline, report):
+            print(f'{case}: {name}: {base:.6g} -> {val:.6g} ({ratio:.2f}x)', file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
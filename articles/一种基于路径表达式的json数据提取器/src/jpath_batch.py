@@ -0,0 +1,182 @@
+# Name: JsonPath Batch
+# Date: 2026-10-18
+# Author: Ais
+# Desc: 基于 JsonPathExtractor 的 JSONL 并行批量提取
+
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import itertools
+import collections
+import concurrent.futures
+
+from jsonpath import JsonPathExtractor
+
+
+def _map_chunk(lines, jpath_map, skip_errors=False, decoder=None):
+    """提取数据块(在工作进程中执行)
+
+    Args:
+        * lines(list): json 文本行列表
+        * jpath_map(dict): 路径表达式映射表
+        * skip_errors(bool): 是否跳过无法解析的行
+        * decoder(str|callable): json 解码器，详见 JsonPathExtractor.get_decoder
+
+    Returns:
+        (list) 提取结果列表
+    """
+    mapper = JsonPathExtractor.compile_map(jpath_map)
+    loads = JsonPathExtractor.get_decoder(decoder)
+    results = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            data = loads(line)
+        except ValueError:
+            if skip_errors:
+                continue
+            raise
+        results.append(mapper(data))
+    return results
+
+
+def _chunks(iterable, chunksize):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_many(iterable, jpath_map, workers=None, chunksize=1000, ordered=True, skip_errors=False, decoder=None):
+    """批量提取
+
+    将 iterable 中的 json 文本行按 chunksize 分块，分发到进程池中通过 JsonPathExtractor.compile_map 编译的提取函数进行提取。
+    同时提交的数据块数量不超过 2 * workers，因此内存占用与输入规模无关。空行会被跳过。
+
+    Args:
+        * iterable(iterable): json 文本行(str|bytes)的可迭代对象
+        * jpath_map(dict): 路径表达式映射表，详见 JsonPathExtractor.map
+        * workers(int): 工作进程数量，默认为 CPU 核数，为 0 时在当前进程中提取
+        * chunksize(int): 每个数据块的行数
+        * ordered(bool): 是否按输入顺序返回结果
+        * skip_errors(bool): 是否跳过无法解析的行
+        * decoder(str|callable): json 解码器，详见 JsonPathExtractor.get_decoder，使用进程池时自定义的解码函数需要支持序列化(pickle)
+
+    Returns:
+        (generator) 提取结果
+
+    Examples:
+        >>> lines = ['{"data": {"id": 1}}', '', '{"data": {"id": 2}}']
+        >>> list(map_many(lines, {"id": {"op": "get", "jpath": "/data/id"}}, workers=0))
+        [{'id': 1}, {'id': 2}]
+        >>> list(map_many(lines, {"id": {"op": "get", "jpath": "/data/id"}}, workers=0, decoder="json"))
+        [{'id': 1}, {'id': 2}]
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    # 提前校验解码器(未安装或者不支持的解码器在提交数据块之前抛出异常)
+    JsonPathExtractor.get_decoder(decoder)
+    chunks = _chunks(iterable, chunksize)
+    if not workers:
+        for chunk in chunks:
+            yield from _map_chunk(chunk, jpath_map, skip_errors, decoder)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+
+        def drain(limit):
+            """取回结果，直到已提交的数据块数量不超过 limit"""
+            while len(pending) > limit:
+                if ordered:
+                    yield from pending.popleft().result()
+                    continue
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+
+        for chunk in chunks:
+            pending.append(executor.submit(_map_chunk, chunk, jpath_map, skip_errors, decoder))
+            yield from drain(2 * workers - 1)
+        yield from drain(0)
+
+
+class RowWriter(object):
+    """提取结果的输出器
+
+    Attributes:
+        * fp(file): 输出文件
+        * fields(list): 字段名列表(csv 格式的表头)
+        * fmt(str): 输出格式，可选的有 ["jsonl", "csv"]
+    """
+
+    def __init__(self, fp, fields, fmt="jsonl"):
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f'Unsupported format({fmt})')
+        self.fp = fp
+        self.fields = list(fields)
+        self.fmt = fmt
+        if fmt == "csv":
+            self._writer = csv.writer(fp)
+            self._writer.writerow(self.fields)
+
+    def write(self, row):
+        if self.fmt == "jsonl":
+            self.fp.write(json.dumps(row, ensure_ascii=False) + "\n")
+            return
+        # 非标量值以 json 格式写入单元格
+        self._writer.writerow([
+            json.dumps(row[field], ensure_ascii=False) if isinstance(row[field], (dict, list)) else row[field]
+            for field in self.fields
+        ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="jpath_batch", description="JSONL 并行批量提取")
+    parser.add_argument("input", help="输入的 JSONL 文件路径，'-' 表示标准输入")
+    parser.add_argument("-m", "--jpath-map", required=True, help="路径表达式映射表(json 文件路径或者 json 字符串)")
+    parser.add_argument("-o", "--output", default="-", help="输出文件路径，'-' 表示标准输出")
+    parser.add_argument("-f", "--format", default="jsonl", choices=["jsonl", "csv"], help="输出格式")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="工作进程数量，默认为 CPU 核数")
+    parser.add_argument("-c", "--chunksize", type=int, default=1000, help="每个数据块的行数")
+    parser.add_argument("--unordered", action="store_true", help="不保持输入顺序(吞吐量更高)")
+    parser.add_argument("--skip-errors", action="store_true", help="跳过无法解析的行")
+    parser.add_argument("-d", "--decoder", default=None, choices=["auto", "json", "orjson", "ujson"], help="json 解码器，默认为 JsonPathExtractor.JSON_DECODER")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="吞吐量报告的时间间隔(秒)")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.jpath_map):
+        with open(args.jpath_map, "r", encoding="utf-8") as f:
+            jpath_map = json.load(f)
+    else:
+        jpath_map = json.loads(args.jpath_map)
+    fin = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    fout = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        writer = RowWriter(fout, jpath_map, args.format)
+        rows, start = 0, time.perf_counter()
+        last = start
+        for row in map_many(fin, jpath_map, args.workers, args.chunksize, not args.unordered, args.skip_errors, args.decoder):
+            writer.write(row)
+            rows += 1
+            now = time.perf_counter()
+            if now - last >= args.report_interval:
+                print(f'[jpath_batch]: rows={rows} rows/s={rows / (now - start):.1f}', file=sys.stderr)
+                last = now
+        elapsed = time.perf_counter() - start
+        print(f'[jpath_batch]: completed rows={rows} elapsed={elapsed:.2f}s rows/s={rows / elapsed if elapsed else 0:.1f}', file=sys.stderr)
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+        if fout is not sys.stdout:
+            fout.close()
+
+
+if __name__ == "__main__":
+    main()
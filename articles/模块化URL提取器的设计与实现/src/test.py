@@ -4,8 +4,14 @@
 # Desc: None
 
 
+import io
+import os
+import re
+import tempfile
 import unittest
-from url_extractor import UrlExtractor
+from url_extractor import UrlExtractor, Document
+from url_extractor.utils import JsonPathPattern
+from url_extractor.processors import UrlAssembler, UrlDupeFilter, UrlBloomDupeFilter, UrlSqliteDupeFilter, UrlDomainFilter
 
 
 class TestUrlExtractor(unittest.TestCase):
@@ -85,6 +91,192 @@ class TestUrlExtractor(unittest.TestCase):
             ['https://www.test.org/article/1', 'https://www.test.org/article/2', 'https://www.test.org/article/3', 'https://www.test.org/article/4', 'https://www.test.org/article/5']
         )
 
+    def test_extract_url_from_json_bytes(self):
+        text = b'{"page_num": 1, "article": [{"url": "https://www.test.org/article/1"}, {"url": "https://www.test.org/article/2"}]}'
+        for data in (text, memoryview(text)):
+            for decoder in ("json", "auto"):
+                self.assertListEqual(
+                    self.extractor.extract(
+                        text = data,
+                        url_extract_exps = (
+                            ("jpath", "/article/\d+/url", {"decoder": decoder}),
+                        )
+                    ),
+                    ['https://www.test.org/article/1', 'https://www.test.org/article/2']
+                )
+
+    def test_extract_url_with_shared_document(self):
+        document = Document("""
+        <ul id="article">
+            <li><a href="https://www.test.org/article/1" data='{"url": "https://www.test.org/article/1"}'></a></li>
+            <li><a href="https://www.test.org/article/2" data='{"url": "https://www.test.org/article/2"}'></a></li>
+        </ul>
+        """)
+        extractors = [
+            UrlExtractor(url_extract_exps=(("xpath", "//ul[@id='article']/li/a/@href"), )),
+            UrlExtractor(url_extract_exps=(("xpath", "//ul[@id='article']/li/a/@data"), ("jpath", "/\d+/url"))),
+        ]
+        html = document.html
+        for extractor in extractors:
+            self.assertListEqual(extractor.extract(document), ['https://www.test.org/article/1', 'https://www.test.org/article/2'])
+        self.assertIs(document.html, html)
+
+    def test_compile_url_extract_exps(self):
+        url_extract_exps = (("xpath", "//a/@data"), ("jpath", "/\d+/url"), ("regex", "https://[\w./]+/\d+"))
+        plan = self.extractor.compile(url_extract_exps)
+        self.assertIs(self.extractor.compile(url_extract_exps), plan)
+        self.assertListEqual(
+            plan("""<a data='{"url": "https://www.test.org/article/1"}'></a>"""),
+            ['https://www.test.org/article/1']
+        )
+        extractor = UrlExtractor()
+        extractor.url_extract_exps = [("regex", "\d+")]
+        self.assertListEqual(extractor.extract("a1b2"), ['1', '2'])
+        extractor.url_extract_exps = [("regex", "[a-z]")]
+        self.assertListEqual(extractor.extract("a1b2"), ['a', 'b'])
+        with self.assertRaises(ValueError):
+            UrlExtractor(url_extract_exps=(("css", "a::attr(href)"), ))
+        with self.assertRaises(ValueError):
+            UrlExtractor(url_extract_exps=(("regex", ), ))
+        # jpath 提取模块直接使用预编译的路径模式
+        jpath_plan = self.extractor.compile((("jpath", "/paths/text/html"), ))
+        self.assertIsInstance(jpath_plan.steps[0][1], JsonPathPattern)
+        self.assertListEqual(jpath_plan('{"paths": {"text/html": "https://www.test.org/article/1"}}'), ['https://www.test.org/article/1'])
+        with self.assertRaises(Exception):
+            UrlExtractor(url_extract_exps=(("xpath", "//a[@href"), ))
+
+    def test_custom_extractor(self):
+        def my_regex(exp, text, params):
+            return re.findall(exp, text)
+        extractor = UrlExtractor(url_extractors={"my_regex": my_regex})
+        self.assertListEqual(extractor.extract("a1b2", (("my_regex", "\d+"), )), ['1', '2'])
+        self.assertListEqual(extractor.extract(Document("a1b2"), (("my_regex", "\d+"), )), ['1', '2'])
+        # 替换内置提取模块时接收原始的提取表达式
+        extractor = UrlExtractor(url_extractors={"regex": my_regex})
+        self.assertListEqual(extractor.extract("a1b2", (("regex", "\d+"), )), ['1', '2'])
+        self.assertIsInstance(extractor.compile((("regex", "\d+"), )).steps[0][1], str)
+
+    def test_extract_url_groups(self):
+        text = """
+        <div id="article"><a href="https://www.test.org/article/1"></a><a href="https://www.test.org/article/2"></a></div>
+        <div id="page"><a href="/page/2"></a></div>
+        <img src="https://www.test.org/image/1.png">
+        """
+        extractor = UrlExtractor(
+            url_extract_groups = {
+                "articles": (("xpath", "//div[@id='article']/a/@href"), ),
+                "pages": {
+                    "url_extract_exps": (("xpath", "//div[@id='page']/a/@href"), ),
+                    "url_processors": [UrlAssembler(url_prefix="https://www.test.org")],
+                },
+                "videos": (("xpath", "//video/@src"), ),
+            }
+        )
+        self.assertDictEqual(
+            extractor.extract_groups(text),
+            {
+                "articles": ['https://www.test.org/article/1', 'https://www.test.org/article/2'],
+                "pages": ['https://www.test.org/page/2'],
+                "videos": [],
+            }
+        )
+
+    def test_iter_extract_url_from_sitemap(self):
+        text = b"""<?xml version="1.0" encoding="UTF-8"?>
+        <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+            <url><loc>https://www.test.org/article/1</loc><lastmod>2023-10-12</lastmod></url>
+            <url><loc>https://www.test.org/page/1</loc></url>
+            <url><loc>https://www.test.org/article/2</loc></url>
+            <url><loc>https://www.test.org/article/1</loc></url>
+        </urlset>
+        """
+        urls = ['https://www.test.org/article/1', 'https://www.test.org/page/1', 'https://www.test.org/article/2', 'https://www.test.org/article/1']
+        self.assertListEqual(self.extractor.extract(text, (("iterparse", "loc"), )), urls)
+        extractor = UrlExtractor(
+            url_extract_exps = (("iterparse", "loc"), ("regex", "https://[\w./]+/article/\d+")),
+            url_processors = [UrlDupeFilter()],
+        )
+        self.assertListEqual(
+            sorted(extractor.iter_extract(io.BytesIO(text), batch_size=1)),
+            ['https://www.test.org/article/1', 'https://www.test.org/article/2']
+        )
+        self.assertListEqual(
+            list(self.extractor.iter_extract("<p><a href='/1'></a><a href='/2'></a></p>", (("iterparse", "a@href", {"html": True}), ))),
+            ['/1', '/2']
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "sitemap.xml")
+            with open(path, "wb") as f:
+                f.write(text)
+            self.assertListEqual(list(self.extractor.iter_extract(path, (("iterparse", "loc", {"path": True}), ))), urls)
+
+    def test_extract_many(self):
+        texts = [f'<a href="https://www.test.org/article/{i % 3}"></a>' for i in range(10)] + [""]
+        for workers in (0, 2):
+            extractor = UrlExtractor(
+                url_extract_exps = (("xpath", "//a/@href"), ),
+                url_processors = [UrlDupeFilter()],
+            )
+            results = list(extractor.extract_many(texts, workers=workers, chunksize=2))
+            self.assertListEqual(results[:4], [['https://www.test.org/article/0'], ['https://www.test.org/article/1'], ['https://www.test.org/article/2'], []])
+            self.assertListEqual(results[4:], [[]] * 7)
+        results = UrlExtractor(url_extract_exps=(("xpath", "//a/@href"), )).extract_many(texts, workers=2, chunksize=3, ordered=False)
+        self.assertListEqual(sorted(url for urls in results for url in urls), sorted(f'https://www.test.org/article/{i % 3}' for i in range(10)))
+
+    def test_bloom_dupefilter(self):
+        url_dupefilter = UrlBloomDupeFilter(capacity=1000, error_rate=0.01)
+        memory = url_dupefilter.stats()["memory"]
+        urls = [f'https://www.test.org/article/{i}' for i in range(1000)]
+        self.assertGreater(len(url_dupefilter(urls)), 980)
+        self.assertListEqual(url_dupefilter(urls), [])
+        stats = url_dupefilter.stats()
+        self.assertEqual(stats["memory"], memory)
+        self.assertTrue(0 < stats["fill_ratio"] < 1)
+        url_dupefilter = UrlBloomDupeFilter(capacity=100, error_rate=0.01, scalable=True)
+        self.assertGreater(len(url_dupefilter(urls)), 980)
+        self.assertListEqual(url_dupefilter(urls[:100]), [])
+
+    def test_sqlite_dupefilter(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "dupefilter.db")
+            urls = [f'https://www.test.org/article/{i}' for i in range(1000)]
+            url_dupefilter = UrlSqliteDupeFilter(path, cache_size=10)
+            self.assertListEqual(url_dupefilter(urls + urls[:10]), urls)
+            self.assertListEqual(url_dupefilter(urls[-5:] + urls[:5]), [])
+            url_dupefilter.close()
+            # 重启后基于磁盘上的数据继续去重
+            url_dupefilter = UrlSqliteDupeFilter(path)
+            self.assertListEqual(url_dupefilter(urls[500:] + ["https://www.test.org/page/1"]), ["https://www.test.org/page/1"])
+            # 多个去重器共享同一个数据库
+            other = UrlSqliteDupeFilter(path)
+            self.assertListEqual(other(["https://www.test.org/page/2"]), ["https://www.test.org/page/2"])
+            self.assertListEqual(url_dupefilter(["https://www.test.org/page/2", "https://www.test.org/page/3"]), ["https://www.test.org/page/3"])
+            other.close()
+            url_dupefilter.close()
+
+    def test_fingerprint_dupefilter(self):
+        url_dupefilter = UrlDupeFilter(fingerprint=True)
+        self.assertListEqual(
+            url_dupefilter(["https://www.test.org/list?page=1&size=10", "https://WWW.TEST.ORG:443/list?size=10&page=1#top", "https://www.test.org/list?page=2&size=10"]),
+            ["https://www.test.org/list?page=1&size=10", "https://www.test.org/list?page=2&size=10"]
+        )
+        urls = [f'https://www.test.org/article/{i}' for i in range(1000)]
+        self.assertListEqual(url_dupefilter(urls), urls)
+        self.assertListEqual(url_dupefilter(urls + ["https://www.test.org/list?size=10&page=2"]), [])
+        self.assertListEqual(url_dupefilter(["http://[bad/", "http://ok/", "http://[bad/"]), ["http://[bad/", "http://ok/"])
+
+    def test_domain_filter(self):
+        urls = ["https://www.test.org/1", "https://WWW.TEST.ORG:8080/2", "https://img.data.org/3", "https://a.b.data.org/4", "https://data.org/5", "/6"]
+        self.assertListEqual(
+            UrlDomainFilter(allow_domain={"www.test.org", "*.data.org"})(urls),
+            ["https://www.test.org/1", "https://WWW.TEST.ORG:8080/2", "https://img.data.org/3", "https://a.b.data.org/4"]
+        )
+        self.assertListEqual(UrlDomainFilter(ignore_domain={"*.data.org", "www.test.org"})(urls), ["https://data.org/5", "/6"])
+        self.assertListEqual(UrlDomainFilter()(urls), urls)
+        self.assertListEqual(UrlDomainFilter(allow_domain={"www.test.org"})(["/go?to=http://www.test.org/x", "//www.test.org/y"]), ["//www.test.org/y"])
+        self.assertListEqual(UrlDomainFilter(allow_domain={"www.test.org:8080"})(urls[:3]), urls[:2])
+        self.assertListEqual(UrlDomainFilter(ignore_domain={"www.test.org:8080", "[::1]:8080"})(urls[:3] + ["http://[::1]:8080/"]), urls[2:3])
+
     def test_extract_url_from_html_mixin_json(self):
         text = """
         {
@@ -4,7 +4,71 @@
 # Desc: 模块化URL提取器
 
 
-from .extractors import xpath_extractor, jpath_extractor, regex_extractor
+import os
+import re
+import types
+import itertools
+import collections
+import concurrent.futures
+import lxml.etree
+from .document import Document, accepts_document, document_source
+from .extractors import xpath_extractor, jpath_extractor, regex_extractor, iterparse_extractor, compile_iterparse_exp
+from .utils import JsonPathPattern
+
+
+class UrlExtractPlan(object):
+    """URL提取计划
+
+    由 UrlExtractor.compile 将 URL提取表达式 编译而成，每个提取步骤保存提取模块的引用，预编译的提取表达式以及扩展参数，
+    执行时不再解析提取表达式的定义。
+
+    Attributes:
+        * steps(tuple): 提取步骤 ((提取模块, 预编译的提取表达式, 扩展参数), ...)
+    """
+
+    def __init__(self, steps:tuple):
+        self.steps = steps
+
+    def __call__(self, text) -> list:
+        """依次执行提取步骤，前一步骤的提取结果作为后一步骤的输入，结果为空时终止"""
+        urls = []
+        for extractor, expression, params in self.steps:
+            urls = extractor(expression, urls or document_source(extractor, text), params)
+            # 流式提取模块的结果(生成器)
+            if isinstance(urls, types.GeneratorType):
+                urls = list(urls)
+            if not urls:
+                break
+        return urls
+
+
+# 内置提取模块的默认编译器: {提取模块: 编译器}
+DEFAULT_URL_COMPILERS = {
+    xpath_extractor: lxml.etree.XPath,
+    jpath_extractor: JsonPathPattern.compile,
+    regex_extractor: re.compile,
+    iterparse_extractor: compile_iterparse_exp,
+}
+
+
+# 工作进程中的URL提取器(由 _init_worker 构建)
+_worker_extractor = None
+
+
+def _init_worker(url_extractors:dict, url_extract_exps:list, url_compilers:dict):
+    """工作进程初始化: 构建不带URL处理模块的提取器并编译提取计划(每个工作进程只执行一次)"""
+    global _worker_extractor
+    _worker_extractor = UrlExtractor(url_extractors, url_extract_exps, None, url_compilers)
+
+
+def _extract_chunk(texts:list) -> list:
+    """提取数据块(在工作进程中执行)，返回未经URL处理模块处理的URL列表"""
+    results = []
+    for text in texts:
+        urls = _worker_extractor.compile(_worker_extractor.url_extract_exps)(Document(text)) if text else []
+        # lxml 的提取结果(_ElementUnicodeResult)转换为 str，避免序列化时携带文档树的引用
+        results.append([str(url) if isinstance(url, str) else url for url in urls] if isinstance(urls, list) else urls)
+    return results
 
 
 class UrlExtractor(object):
@@ -16,9 +80,17 @@ class UrlExtractor(object):
         * url_extract_exps(list): URL提取表达式，通过该表达式来指定待提取的URL模式。
         * url_extractors(dict): URL提取模块容器是一个映射字典，键为提取模块id，值为提取模块的引用，通过 url_extract_exps(URL提取表达式) 进行调用。
         * url_processors(list): URL处理模块容器是一个列表结构，其中每个子模块是一个可调用对象，用于处理提取后的URL，例如过滤，拼接等操作。
+        * url_compilers(dict): 提取表达式编译器容器，键为提取模块id，值为将提取表达式编译为对应提取模块可接受的预编译对象的函数(为 None 时不编译)，
+            未注册编译器的内置提取模块使用 DEFAULT_URL_COMPILERS 中的默认编译器，其他提取模块直接使用原始的提取表达式。
+        * url_extract_groups(dict): 命名的URL提取表达式分组，键为分组名，值为该分组的URL提取表达式，
+            或者 {"url_extract_exps": URL提取表达式, "url_processors": 该分组的URL处理模块容器(默认为 url_processors)}
 
     Methods:
         * extract: 提取URL(调用入口)
+        * extract_groups: 基于同一个文档上下文提取所有分组的URL
+        * iter_extract: 流式提取URL(适用于 sitemap 等大型文档)
+        * extract_many: 通过进程池批量提取URL
+        * compile: 将 URL提取表达式 编译为提取计划(带缓存)
 
     Examples:
         >>> urls = UrlExtractor(
@@ -26,19 +98,44 @@ class UrlExtractor(object):
         ...         ("xpath", "//ul[@id='article']/li/a/@href"),
         ...     )
         ... ).extract(text)
+        >>> # 多个提取器共享同一个文档上下文，文档只会被解析一次
+        >>> document = Document(text)
+        >>> urls = [extractor.extract(document) for extractor in extractors]
+        >>> # 在一次解析中提取多个分组
+        >>> groups = UrlExtractor(
+        ...     url_extract_groups={
+        ...         "articles": (("xpath", "//ul[@id='article']/li/a/@href"), ),
+        ...         "images": {"url_extract_exps": (("xpath", "//img/@src"), ), "url_processors": [UrlAssembler(url_prefix="https://www.test.org")]},
+        ...     }
+        ... ).extract_groups(text)
+        >>> # 流式提取大型 sitemap
+        >>> with open("sitemap.xml", "rb") as f:
+        ...     for url in UrlExtractor(url_extract_exps=(("iterparse", "loc"), )).iter_extract(f):
+        ...         print(url)
     """
 
-    def __init__(self, url_extractors:dict=None, url_extract_exps:list=None, url_processors:list=None):
+    def __init__(self, url_extractors:dict=None, url_extract_exps:list=None, url_processors:list=None, url_compilers:dict=None, url_extract_groups:dict=None):
         # URL提取模块容器
         self.url_extractors = url_extractors or {
             "xpath": xpath_extractor,
             "jpath": jpath_extractor,
-            "regex": regex_extractor
+            "regex": regex_extractor,
+            "iterparse": iterparse_extractor,
         }
         # URL提取表达式
         self.url_extract_exps = url_extract_exps or []
         # URL处理模块容器
         self.url_processors = url_processors or []
+        # 提取表达式编译器容器
+        self.url_compilers = url_compilers or {}
+        # 提取计划缓存: {URL提取表达式: 提取计划}
+        self._plans = {}
+        # URL提取表达式分组
+        self.url_extract_groups = url_extract_groups or {}
+        # 预编译提取计划(同时校验提取表达式)
+        if self.url_extract_exps:
+            self.compile(self.url_extract_exps)
+        self.compile_groups(self.url_extract_groups)
 
     def extract(self, text:str, url_extract_exps:list=None) -> list:
         """提取URL(调用入口)
@@ -46,7 +143,8 @@ class UrlExtractor(object):
         根据 URL提取表达式 从文本中提取出URL列表。
 
         Args:
-            * text: 目标文本
+            * text: 目标文本(str, bytes 或者 Document)，str 和 bytes 类型的文本会被封装为 Document，
+                同一次提取中的所有提取模块共享其解析结果，未声明支持 Document 的提取模块(详见 accepts_document)接收原始文本。
             * url_extract_exps: URL提取表达式，当该参数为空时，使用类初始化时传入的 url_extract_exps 参数。
 
         Returns:
@@ -58,32 +156,205 @@ class UrlExtractor(object):
         url_extract_exps = url_extract_exps or self.url_extract_exps
         if not text or not url_extract_exps:
             raise ValueError("text or url_extract_exps must be not None")
-        urls = self.extract_urls(url_extract_exps, text)
+        if isinstance(text, (str, bytes, bytearray, memoryview)):
+            text = Document(text)
+        plan = self.compile(url_extract_exps)
+        urls = plan(text)
         return self.process_urls(urls) if urls else []        
 
-    def extract_urls(self, url_extract_exps:list, text:str) -> list:
-        """提取URL(内部实现)
+    def extract_groups(self, text:str, url_extract_groups:dict=None) -> dict:
+        """提取分组URL
+
+        将文本封装为同一个 Document，依次执行每个分组的提取计划并通过该分组的URL处理模块处理提取结果，
+        所有分组共享同一次解析的结果(HTML树，json数据对象等)。
+
+        Args:
+            * text: 目标文本(str, bytes 或者 Document)
+            * url_extract_groups: URL提取表达式分组，当该参数为空时，使用类初始化时传入的 url_extract_groups 参数。
+
+        Returns:
+            (dict) {分组名: 提取出的URL列表}
 
-        根据 URL提取表达式 从 self.url_extractors 查找指定提取模块来提取URL。
+        Raises:
+            * ValueError: text 或者 url_extract_groups(self.url_extract_groups) 为空时抛出异常。
         """
-        urls = []
+        url_extract_groups = url_extract_groups or self.url_extract_groups
+        if not text or not url_extract_groups:
+            raise ValueError("text or url_extract_groups must be not None")
+        if isinstance(text, (str, bytes, bytearray, memoryview)):
+            text = Document(text)
+        group_plans = self.compile_groups(url_extract_groups)
+        results = {}
+        for group, (plan, url_processors) in group_plans.items():
+            urls = plan(text)
+            results[group] = self.process_urls(urls, url_processors) if urls else []
+        return results
+
+    def iter_extract(self, text, url_extract_exps:list=None, batch_size:int=1000):
+        """流式提取URL
+
+        由提取计划的第一个提取步骤(通常为 iterparse 提取模块)逐个产出URL，按 batch_size 分批交由后续提取步骤
+        以及 URL处理模块 处理，URL处理模块(如 UrlDupeFilter)在批次之间保持状态。
+        与 extract 不同，提取结果不会被整体保存在内存中，内存占用只取决于单个元素与批次的大小。
+
+        Args:
+            * text: 目标文本(文件对象，文件路径(os.PathLike)，str, bytes 或者 Document)，
+                str 类型的文件路径需要通过提取表达式的扩展参数声明，如 ("iterparse", "loc", {"path": True})
+            * url_extract_exps: URL提取表达式，当该参数为空时，使用类初始化时传入的 url_extract_exps 参数。
+            * batch_size(int): 每批处理的URL数量
+
+        Returns:
+            (generator) 提取出的URL
+
+        Raises:
+            * ValueError: text 或者 url_extract_exps(self.url_extract_exps) 为空时抛出异常。
+        """
+        url_extract_exps = url_extract_exps or self.url_extract_exps
+        if text is None or not url_extract_exps:
+            raise ValueError("text or url_extract_exps must be not None")
+        if isinstance(text, (str, bytes, bytearray, memoryview)):
+            text = Document(text)
+        plan = self.compile(url_extract_exps)
+        (extractor, expression, params), rest = plan.steps[0], UrlExtractPlan(plan.steps[1:])
+        urls = iter(extractor(expression, document_source(extractor, text), params))
+        while True:
+            batch = list(itertools.islice(urls, batch_size))
+            if not batch:
+                return
+            if rest.steps:
+                batch = rest(batch)
+            if batch:
+                yield from self.process_urls(batch)
+
+    def extract_many(self, texts, workers:int=None, chunksize:int=100, ordered:bool=True):
+        """批量提取URL
+
+        将 texts 按 chunksize 分块，分发到进程池中提取。提取模块，提取表达式与编译器只在工作进程初始化时发送一次，
+        并在工作进程中编译为提取计划；URL处理模块在当前进程中按结果的产出顺序执行，因此有状态的处理模块(如 UrlDupeFilter)
+        的行为与逐个调用 extract 一致。同时提交的数据块数量不超过 2 * workers。
+
+        Args:
+            * texts(iterable): 目标文本(str|bytes)的可迭代对象
+            * workers(int): 工作进程数量，默认为 CPU 核数，为 0 时在当前进程中提取
+            * chunksize(int): 每个数据块的文本数量
+            * ordered(bool): 是否按输入顺序返回结果，为 False 时按数据块的完成顺序返回
+
+        Returns:
+            (generator) 每个文本提取出的URL列表(空文本的结果为空列表)
+
+        Raises:
+            * ValueError: self.url_extract_exps 为空时抛出异常。
+        """
+        if not self.url_extract_exps:
+            raise ValueError("url_extract_exps must be not None")
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        texts = iter(texts)
+        chunks = iter(lambda: list(itertools.islice(texts, chunksize)), [])
+        if not workers:
+            for chunk in chunks:
+                for text in chunk:
+                    yield self.extract(text) if text else []
+            return
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(self.url_extractors, self.url_extract_exps, self.url_compilers)
+        ) as executor:
+            pending = collections.deque()
+
+            def drain(limit):
+                """取回结果，直到已提交的数据块数量不超过 limit"""
+                while len(pending) > limit:
+                    if ordered:
+                        done = [pending.popleft()]
+                    else:
+                        done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in done:
+                            pending.remove(future)
+                    for future in done:
+                        for urls in future.result():
+                            yield self.process_urls(urls) if urls else []
+
+            for chunk in chunks:
+                pending.append(executor.submit(_extract_chunk, chunk))
+                yield from drain(2 * workers - 1)
+            yield from drain(0)
+
+    def compile_groups(self, url_extract_groups:dict) -> dict:
+        """编译分组的提取计划
+
+        Returns:
+            (dict) {分组名: (提取计划, URL处理模块容器)}
+        """
+        group_plans = {}
+        for group, conf in url_extract_groups.items():
+            if isinstance(conf, dict):
+                url_extract_exps, url_processors = conf["url_extract_exps"], conf.get("url_processors", self.url_processors)
+            else:
+                url_extract_exps, url_processors = conf, self.url_processors
+            group_plans[group] = (self.compile(url_extract_exps), url_processors)
+        return group_plans
+
+    def compile(self, url_extract_exps:list) -> UrlExtractPlan:
+        """编译提取计划
+
+        校验 URL提取表达式，查找提取模块并通过 self.url_compilers(或者内置提取模块的默认编译器) 预编译提取表达式(如 lxml.etree.XPath, re.compile)，
+        编译结果按提取表达式(以及对应的提取模块与编译器)缓存，修改 url_extract_exps 或者 url_extractors 后无需重新创建提取器。
+
+        Args:
+            * url_extract_exps: URL提取表达式
+
+        Returns:
+            (UrlExtractPlan) 提取计划
+
+        Raises:
+            * ValueError: 提取表达式格式错误或者提取模块不存在时抛出异常。
+
+        Examples:
+            >>> plan = UrlExtractor().compile((("xpath", "//a/@href"), ("regex", "\\d+")))
+            >>> plan("<a href='/article/1'></a><a href='/article/2'></a>")
+            ['1', '2']
+        """
+        exps = []
         for url_extract_exp in url_extract_exps:
             if len(url_extract_exp) == 3:
-                extractor_id, extract_exp, extend_params = url_extract_exp
+                exps.append(tuple(url_extract_exp))
+            elif len(url_extract_exp) == 2:
+                exps.append((*url_extract_exp, {}))
             else:
-                extractor_id, extract_exp, extend_params = *url_extract_exp, {}
-            # 调用指定的提取模块解析执行提取表达式
-            urls = self.url_extractors[extractor_id](extract_exp, urls or text, extend_params)
-            if not urls:
-                break
-        return urls
+                raise ValueError(f'Invalid url_extract_exp({url_extract_exp})')
+        try:
+            key = tuple((extractor_id, self.url_extractors.get(extractor_id), self.url_compilers.get(extractor_id), extract_exp, tuple(sorted(extend_params.items()))) for extractor_id, extract_exp, extend_params in exps)
+            plan = self._plans.get(key)
+        except (TypeError, AttributeError):
+            key, plan = None, None
+        if plan is not None:
+            return plan
+        steps = []
+        for extractor_id, extract_exp, extend_params in exps:
+            if extractor_id not in self.url_extractors:
+                raise ValueError(f'Unsupported extractor({extractor_id})')
+            extractor = self.url_extractors[extractor_id]
+            # 默认编译器只用于其对应的内置提取模块
+            compiler = self.url_compilers[extractor_id] if extractor_id in self.url_compilers else DEFAULT_URL_COMPILERS.get(extractor)
+            steps.append((extractor, compiler(extract_exp) if compiler else extract_exp, extend_params))
+        plan = UrlExtractPlan(tuple(steps))
+        if key is not None:
+            self._plans[key] = plan
+        return plan
+
+    def extract_urls(self, url_extract_exps:list, text:str) -> list:
+        """提取URL(内部实现)
+
+        根据 URL提取表达式 从 self.url_extractors 查找指定提取模块来提取URL，详见 compile。
+        """
+        return self.compile(url_extract_exps)(text)
     
-    def process_urls(self, urls:list) -> list:
+    def process_urls(self, urls:list, url_processors:list=None) -> list:
         """处理URLs
         
-        通过 self.url_processors(URL处理模块) 依次处理提取出的URL列表。
+        通过 url_processors(URL处理模块，默认为 self.url_processors) 依次处理提取出的URL列表。
         """
-        for processor in self.url_processors:
+        for processor in (self.url_processors if url_processors is None else url_processors):
             urls = processor(urls)
             if not urls:
                 break
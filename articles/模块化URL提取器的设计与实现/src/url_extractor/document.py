@@ -0,0 +1,95 @@
+# Name: 文档上下文
+# Date: 2026-10-18
+# Author: Ais
+# Desc: 在多个提取模块之间共享的文档解析结果
+
+
+import lxml.etree
+from .utils import JsonPathExtractor
+
+
+class Document(object):
+    """文档上下文
+
+    封装待提取的原始文本，按需解析并缓存其不同的表示形式(原始文本，HTML树，json数据对象，路径索引)，
+    每种表示形式只在首次访问时解析一次。在同一个文档上运行多个 URL提取表达式 或者多个 UrlExtractor 时，
+    通过共享同一个 Document 对象来避免重复解析。
+
+    Attributes:
+        * source(str|bytes): 原始文本数据
+        * encoding(str): bytes 类型的原始文本的编码
+        * decoder(str|callable): json 解码器，详见 .utils.JsonPathExtractor.get_decoder
+        * text(str): 原始文本
+        * html(lxml.etree._Element): HTML树
+        * json(dict|list): json数据对象
+        * jpath(JsonPathExtractor): json数据对象的路径提取器(惰性模式)
+
+    Examples:
+        >>> document = Document('{"article": [{"url": "https://www.test.org/article/1"}]}')
+        >>> document.jpath.find("/article/\d+/url")
+        ['https://www.test.org/article/1']
+        >>> document.json is document.jpath.data
+        True
+    """
+
+    def __init__(self, source, encoding:str="utf-8", decoder=None):
+        if not isinstance(source, (str, bytes, bytearray, memoryview)):
+            raise ValueError(f'Unsupported source({type(source)})')
+        self.source = source
+        self.encoding = encoding
+        self.decoder = decoder
+        # 解析结果缓存: {表示形式: 解析结果}
+        self._cache = {}
+
+    def __bool__(self):
+        return len(self.source) > 0
+
+    def _parse(self, name, parser):
+        """解析指定的表示形式(带缓存)"""
+        if name not in self._cache:
+            self._cache[name] = parser()
+        return self._cache[name]
+
+    @property
+    def text(self) -> str:
+        """原始文本"""
+        return self._parse("text", lambda: self.source if isinstance(self.source, str) else bytes(self.source).decode(self.encoding))
+
+    @property
+    def html(self):
+        """HTML树(bytes 类型的原始文本直接交由 lxml 解析)"""
+        return self._parse("html", lambda: lxml.etree.HTML(self.source if isinstance(self.source, (str, bytes)) else bytes(self.source)))
+
+    @property
+    def json(self):
+        """json数据对象"""
+        return self._parse("json", lambda: JsonPathExtractor.loads(self.source, self.decoder))
+
+    @property
+    def jpath(self) -> JsonPathExtractor:
+        """json数据对象的路径提取器
+
+        采用惰性模式，只为正则回退匹配涉及的子树构建路径索引表，已构建的索引在多次提取之间复用。
+        """
+        return self._parse("jpath", lambda: JsonPathExtractor(self.json, lazy=True))
+
+
+def accepts_document(extractor):
+    """声明提取模块支持 Document 类型的输入(装饰器)
+
+    UrlExtractor 只会将 Document 传递给声明了该特性的提取模块，其他提取模块(如自定义的提取模块)接收原始文本(Document.source)。
+
+    Examples:
+        >>> @accepts_document
+        ... def title_extractor(expression, text, params=None):
+        ...     return text.html.xpath(expression)
+    """
+    extractor.accepts_document = True
+    return extractor
+
+
+def document_source(extractor, text):
+    """获取传递给提取模块的文本: 提取模块未声明支持 Document 时返回其原始文本"""
+    if isinstance(text, Document) and not getattr(extractor, "accepts_document", False):
+        return text.source
+    return text
@@ -4,24 +4,31 @@
 # Desc: None
 
 
+import io
+import os
 import re
 import json
 import lxml.etree
 from .utils import JsonPathExtractor
+from .document import Document, accepts_document
 
 
+@accepts_document
 def xpath_extractor(expression:str, text:str, params:dict=None) -> list:
     """xpath-URL提取器
     
     通过 xpath 表达式从文本中提取URL列表。
 
     Args:
-        * expression(str): 目标URL的xpath表达式
-        * text(str): html文本数据
+        * expression(str|lxml.etree.XPath): 目标URL的xpath表达式(或者预编译的 XPath 对象)
+        * text(str|Document): html文本数据，传入 Document 时复用其已解析的HTML树
 
     Returns:
         (list) 提取出的URL列表
     """
+    xpath = expression if isinstance(expression, lxml.etree.XPath) else lxml.etree.XPath(expression)
+    if isinstance(text, Document):
+        return xpath(text.html)
     if isinstance(text, str):
         data = text
     elif isinstance(text, (list, tuple)):
@@ -29,40 +36,51 @@ def xpath_extractor(expression:str, text:str, params:dict=None) -> list:
     else:
         raise ValueError(f'Unsupported text({type(text)})')
     html = lxml.etree.HTML(data)
-    return html.xpath(expression)
+    return xpath(html)
 
 
+@accepts_document
 def jpath_extractor(expression:str, text:str, params:dict=None) -> list:
     """jpath-URL提取器
 
     通过 jpath(路径表达式) 从json数据中提取URL列表。
 
     Args:
-        * expression(str): 路径表达式，详见 .utils.JsonPathExtractor 中的定义。
-        * text(str): json格式的文本数据
+        * expression(str|JsonPathPattern): 路径表达式(或者预编译的路径模式)，详见 .utils.JsonPathExtractor 中的定义。
+        * text(str|bytes|Document): json格式的文本数据，支持 bytes, bytearray, memoryview(如 HTTP 响应体)，无需预先转换为 str，
+            传入 Document 时复用其已解码的json数据对象与路径提取器
+        * params(dict): 扩展参数
+            * decoder(str|callable): json 解码器，详见 .utils.JsonPathExtractor.get_decoder
 
     Returns:
         (list) 提取出的URL列表
     """
-    if isinstance(text, str):
-        data = json.loads(text)
+    params = params or {}
+    if isinstance(text, Document):
+        if params.get("decoder") is None:
+            return text.jpath.find(expression, default=[])
+        text = text.source
+    loads = JsonPathExtractor.get_decoder(params.get("decoder"))
+    if isinstance(text, (str, bytes, bytearray, memoryview)):
+        data = loads(text)
     elif isinstance(text, (list, tuple)):
-        data = [json.loads(d) if isinstance(d, str) else d for d in text]
+        data = [loads(d) if isinstance(d, (str, bytes, bytearray, memoryview)) else d for d in text]
     elif isinstance(text, dict):
         data = text
     else:
         raise ValueError(f'Unsupported text({type(text)})')
-    return JsonPathExtractor(data).find(expression, default=[])
+    return JsonPathExtractor(data, lazy=True).find(expression, default=[])
 
 
+@accepts_document
 def regex_extractor(expression:str, text:str, params:dict=None) -> list:
     """regex-URL提取器
 
     通过 re(正则表达式) 模块中 re.findall 方法从文本数据中提取URL列表。
 
     Args:
-        * expression(str): 目标URL的正则表达式
-        * text(str): html文本数据
+        * expression(str|re.Pattern): 目标URL的正则表达式(或者预编译的正则对象)
+        * text(str|Document): html文本数据
         * params(dict): 扩展参数
             * toStr(bool): 将结果转换成字符串
 
@@ -70,7 +88,9 @@ def regex_extractor(expression:str, text:str, params:dict=None) -> list:
         (list) 提取出的URL列表
     """
     params = params or {}
-    if isinstance(text, str):
+    if isinstance(text, Document):
+        data = text.text
+    elif isinstance(text, str):
         data = text
     elif isinstance(text, (dict, list, tuple)):
         data = json.dumps(text)
@@ -79,3 +99,73 @@ def regex_extractor(expression:str, text:str, params:dict=None) -> list:
     urls = re.findall(expression, data)
     return "".join(urls) if params.get("toStr") else urls
 
+
+
+def compile_iterparse_exp(expression:str) -> tuple:
+    """编译 iterparse 提取表达式
+
+    提取表达式的格式为 "tag" 或者 "tag@attr"，前者提取元素的文本，后者提取元素的属性值。
+    不带命名空间的 tag 匹配任意命名空间下的同名元素(如 sitemap 中的 {http://www.sitemaps.org/schemas/sitemap/0.9}loc)，
+    "*" 匹配任意元素。
+
+    Returns:
+        (tuple) (tag, attr)
+
+    Examples:
+        >>> compile_iterparse_exp("loc")
+        ('loc', None)
+        >>> compile_iterparse_exp("a@href")
+        ('a', 'href')
+    """
+    if isinstance(expression, tuple):
+        return expression
+    tag, _, attr = expression.partition("@")
+    if not tag:
+        raise ValueError(f'Invalid iterparse expression({expression})')
+    return (tag, attr or None)
+
+
+@accepts_document
+def iterparse_extractor(expression:str, text, params:dict=None):
+    """iterparse-URL提取器
+
+    通过 lxml.etree.iterparse 流式解析 xml/html 文档(如 sitemap, rss)并逐个产出URL，
+    每个元素处理完毕后立即清理(包括已处理的兄弟元素)，内存占用与文档大小无关，只取决于单个元素的大小。
+
+    Args:
+        * expression(str|tuple): 提取表达式 "tag" 或者 "tag@attr"(或者 compile_iterparse_exp 的编译结果)
+        * text(file|os.PathLike|str|bytes|Document): 文件对象(具有 read 方法)或者文件路径(os.PathLike)时流式读取，
+            str, bytes 以及 Document 类型的文本数据在内存中解析(params["path"] 为 True 时 str 被视为文件路径)
+        * params(dict): 扩展参数
+            * html(bool): 使用 html 解析器(默认为 xml 解析器)
+            * path(bool): 将 str 类型的 text 作为文件路径
+            * huge_tree(bool): 关闭 libxml2 对文档大小与嵌套深度的安全限制，只应用于可信的超大文档(默认为 False)
+
+    Returns:
+        (generator) 提取出的URL
+    """
+    params = params or {}
+    tag, attr = compile_iterparse_exp(expression)
+    if isinstance(text, Document):
+        text = text.source
+    if isinstance(text, str):
+        source = text if params.get("path") else io.BytesIO(text.encode("utf-8"))
+    elif isinstance(text, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(text)
+    elif hasattr(text, "read") or isinstance(text, os.PathLike):
+        source = text
+    else:
+        raise ValueError(f'Unsupported text({type(text)})')
+    # 不带命名空间的 tag 按本地名称匹配
+    suffix = None if tag == "*" or tag.startswith("{") else "}" + tag
+    for _, elem in lxml.etree.iterparse(source, events=("end", ), html=params.get("html", False), huge_tree=params.get("huge_tree", False), recover=params.get("html", False)):
+        if tag == "*" or elem.tag == tag or (suffix and isinstance(elem.tag, str) and elem.tag.endswith(suffix)):
+            url = elem.get(attr) if attr else elem.text
+            if url and url.strip():
+                yield url.strip()
+        # 清理已处理的元素及其之前的兄弟元素
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
@@ -5,14 +5,22 @@
 
 
 import re
-from urllib.parse import urljoin, urlparse
+import sqlite3
+import collections
+from urllib.parse import urljoin
+from .utils import BloomFilter, ScalableBloomFilter, FingerprintSet, url_fingerprint, DomainTrie, url_host
 
 
-def UrlDupeFilter():
+def UrlDupeFilter(fingerprint:bool=False):
     """URL去重器
     
     对重复URL进行过滤，使用 set 数据结构进行去重处理。
 
+    Args:
+        * fingerprint: 指纹模式，将URL规范化(详见 .utils.canonicalize_url)后只保存其 64 位指纹(.utils.FingerprintSet)，
+            平均每个URL的内存占用不超过 10 字节，除指纹碰撞外结果是精确的。该模式下保持URL的原始顺序，
+            规范化后相同的URL(如仅参数顺序或片段不同)被视为重复URL。
+
     Examples:
         >>> url_dupefilter = UrlDupeFilter()
         >>> url_dupefilter(["https://www.test.com/page/1", "https://www.test.com/page/2"]
@@ -20,6 +28,11 @@ def UrlDupeFilter():
         >>> url_dupefilter(["https://www.test.com/page/2", "https://www.test.com/page/3"]
         ['https://www.test.com/page/3']
     """
+    if fingerprint:
+        fingerprints = FingerprintSet()
+        def url_fingerprint_dupefilter(urls:list) -> list:
+            return [url for url in urls if fingerprints.add(url_fingerprint(url))]
+        return url_fingerprint_dupefilter
     url_dupefilter_set = set()
     def url_dupefilter(urls:list) -> list:
         urls = set(urls) - url_dupefilter_set
@@ -28,10 +41,120 @@ def UrlDupeFilter():
     return url_dupefilter
 
 
+def UrlBloomDupeFilter(capacity:int=1000000, error_rate:float=0.001, scalable:bool=False, max_filters:int=None):
+    """URL去重器(布隆过滤器)
+
+    UrlDupeFilter 的替代实现，使用布隆过滤器进行去重处理，不保存URL字符串，内存占用由 capacity 和 error_rate 决定，
+    与处理的URL数量无关。代价是存在误判(新URL以 error_rate 的概率被当作重复URL过滤)，且不支持删除。
+    保持URL的原始顺序，同一批次中的重复URL同样会被过滤。
+
+    Args:
+        * capacity: 预期容量(URL数量)
+        * error_rate: 达到预期容量时的目标误判率
+        * scalable: 是否在达到预期容量后自动扩展(ScalableBloomFilter)，否则内存占用固定，超出容量后误判率升高
+        * max_filters: 扩展的过滤器数量上限，详见 .utils.ScalableBloomFilter
+
+    Returns:
+        URL去重器，通过其 stats() 方法获取统计信息: {"count": 已记录的URL数量, "fill_ratio": 位数组填充率, "memory": 内存占用(字节)}
+
+    Examples:
+        >>> url_dupefilter = UrlBloomDupeFilter(capacity=1000, error_rate=0.001)
+        >>> url_dupefilter(["https://www.test.com/page/1", "https://www.test.com/page/2"])
+        ['https://www.test.com/page/1', 'https://www.test.com/page/2']
+        >>> url_dupefilter(["https://www.test.com/page/2", "https://www.test.com/page/3", "https://www.test.com/page/3"])
+        ['https://www.test.com/page/3']
+        >>> url_dupefilter.stats()["count"]
+        3
+    """
+    bloom = ScalableBloomFilter(capacity, error_rate, max_filters=max_filters) if scalable else BloomFilter(capacity, error_rate)
+    def url_dupefilter(urls:list) -> list:
+        return [url for url in urls if bloom.add(url)]
+    def stats() -> dict:
+        return {"count": len(bloom), "fill_ratio": bloom.fill_ratio(), "memory": bloom.sizeof()}
+    url_dupefilter.stats = stats
+    return url_dupefilter
+
+
+def UrlSqliteDupeFilter(path:str, cache_size:int=10000, table:str="urls"):
+    """URL去重器(持久化)
+
+    UrlDupeFilter 的持久化实现，已处理的URL保存在 sqlite 数据库中，进程重启后直接基于磁盘上的数据继续去重，无需预先加载。
+    每次调用中的URL在同一个事务中批量查询与写入，并通过内存中的 LRU 缓存(最近处理的URL)减少数据库查询。
+    保持URL的原始顺序，同一批次中的重复URL同样会被过滤。
+
+    Args:
+        * path: 数据库文件路径
+        * cache_size: LRU 缓存的URL数量，为 0 时不启用缓存
+        * table: 数据表名称
+
+    Returns:
+        URL去重器，通过其 close() 方法关闭数据库连接
+
+    Examples:
+        >>> import os, shutil, tempfile
+        >>> tmpdir = tempfile.mkdtemp()
+        >>> url_dupefilter = UrlSqliteDupeFilter(os.path.join(tmpdir, "dupefilter.db"))
+        >>> url_dupefilter(["https://www.test.com/page/1", "https://www.test.com/page/2"])
+        ['https://www.test.com/page/1', 'https://www.test.com/page/2']
+        >>> url_dupefilter(["https://www.test.com/page/2", "https://www.test.com/page/3"])
+        ['https://www.test.com/page/3']
+        >>> url_dupefilter.close()
+        >>> url_dupefilter = UrlSqliteDupeFilter(os.path.join(tmpdir, "dupefilter.db"))
+        >>> url_dupefilter(["https://www.test.com/page/1", "https://www.test.com/page/4"])
+        ['https://www.test.com/page/4']
+        >>> url_dupefilter.close()
+        >>> shutil.rmtree(tmpdir)
+    """
+    if not re.fullmatch(r'\w+', table):
+        raise ValueError(f'Invalid table({table})')
+    # 自动提交模式，由 url_dupefilter 显式管理事务
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f'CREATE TABLE IF NOT EXISTS {table} (url TEXT PRIMARY KEY) WITHOUT ROWID')
+    cache = collections.OrderedDict()
+    # sqlite 的单条语句参数数量上限
+    batch_size = 500
+    def url_dupefilter(urls:list) -> list:
+        # 过滤批次内的重复URL以及缓存中的URL
+        candidates = []
+        for url in dict.fromkeys(urls):
+            if url in cache:
+                cache.move_to_end(url)
+            else:
+                candidates.append(url)
+        if not candidates:
+            return []
+        # 查询与写入在同一个写事务中执行(BEGIN IMMEDIATE 获取写锁)，共享数据库的其他进程无法在两者之间写入
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            exists = set()
+            for i in range(0, len(candidates), batch_size):
+                batch = candidates[i:i+batch_size]
+                exists.update(row[0] for row in conn.execute(f'SELECT url FROM {table} WHERE url IN ({",".join("?" * len(batch))})', batch))
+            new_urls = [url for url in candidates if url not in exists]
+            conn.executemany(f'INSERT OR IGNORE INTO {table} (url) VALUES (?)', ((url, ) for url in new_urls))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        if cache_size:
+            for url in candidates:
+                cache[url] = None
+            while len(cache) > cache_size:
+                cache.popitem(last=False)
+        return new_urls
+    url_dupefilter.close = conn.close
+    return url_dupefilter
+
+
 def UrlDomainFilter(allow_domain:set=None, ignore_domain:set=None):
     """URL域名过滤器
 
     通过指定的域名集合对URL列表进行过滤。
+    域名集合被构建为反向域名标签的前缀树(.utils.DomainTrie)，匹配时忽略端口与大小写(规则中的端口会被去除，如 "www.test.com:8080" 匹配 www.test.com 的任意端口)，
+    支持 "*.test.com" 形式的通配符规则(匹配任意子域名)。
+    主机名通过字符串切片提取(.utils.url_host)，同一个主机名的匹配结果会被缓存。
     
     Args:
         * allow_domain: 允许的域名列表
@@ -45,13 +168,28 @@ def UrlDomainFilter(allow_domain:set=None, ignore_domain:set=None):
         >>> url_domain_filter = UrlDomainFilter(ignore_domain={"www.data.com"})
         >>> url_domain_filter(["https://www.test.com/", "https://www.data.com/"])
         ['https://www.test.com/']
+        >>> url_domain_filter = UrlDomainFilter(allow_domain={"*.test.com"})
+        >>> url_domain_filter(["https://img.test.com:8080/1.png", "https://test.com/", "https://www.data.com/"])
+        ['https://img.test.com:8080/1.png']
     """
+    domains, allow = (allow_domain, True) if allow_domain else (ignore_domain, False)
+    if not domains:
+        return lambda urls: urls
+    trie = DomainTrie(domains)
+    # 主机名的匹配结果缓存: {主机名: 是否通过}
+    cache = {}
     def url_domain_filter(urls:list) -> list:
-        if allow_domain:
-            return [url for url in urls if urlparse(url).netloc in allow_domain]
-        if ignore_domain:
-            return [url for url in urls if urlparse(url).netloc not in ignore_domain]
-        return urls
+        if len(cache) > 100000:
+            cache.clear()
+        results = []
+        for url in urls:
+            host = url_host(url)
+            passed = cache.get(host)
+            if passed is None:
+                passed = cache[host] = trie.match(host) == allow
+            if passed:
+                results.append(url)
+        return results
     return url_domain_filter
 
 
@@ -1 +1,4 @@
-from .jsonpath import JsonPathExtractor
\ No newline at end of file
+from .jsonpath import JsonPathExtractor, JsonPathPattern
+from .bloomfilter import BloomFilter, ScalableBloomFilter
+from .fingerprint import FingerprintSet, canonicalize_url, url_fingerprint
+from .domaintrie import DomainTrie, url_host
\ No newline at end of file
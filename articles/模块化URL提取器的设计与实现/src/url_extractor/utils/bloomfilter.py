@@ -0,0 +1,133 @@
+# Name: BloomFilter
+# Date: 2026-10-18
+# Author: Ais
+# Desc: 基于 bytearray 的布隆过滤器(固定容量与可扩展容量)
+
+
+import math
+import hashlib
+
+
+class BloomFilter(object):
+    """布隆过滤器
+
+    位数组存储在 bytearray 中，内存占用在创建时确定，与插入的元素数量无关。
+    通过 blake2b 摘要的两个 64 位整数进行双重哈希(h1 + i * h2)生成 k 个位索引。
+
+    Attributes:
+        * capacity(int): 预期容量
+        * error_rate(float): 达到预期容量时的目标误判率
+        * size(int): 位数组长度
+        * hashes(int): 哈希函数数量
+        * count(int): 已插入的元素数量
+
+    Examples:
+        >>> bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        >>> bloom.add("https://www.test.com/page/1")
+        True
+        >>> bloom.add("https://www.test.com/page/1")
+        False
+        >>> "https://www.test.com/page/1" in bloom, "https://www.test.com/page/2" in bloom
+        (True, False)
+    """
+
+    def __init__(self, capacity:int, error_rate:float=0.001):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError(f'Invalid capacity({capacity}) or error_rate({error_rate})')
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # 最优位数组长度 m = -n * ln(p) / ln(2)^2，哈希函数数量 k = m / n * ln(2)
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _indexes(self, item) -> list:
+        if isinstance(item, str):
+            item = item.encode("utf-8")
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, item) -> bool:
+        bits = self.bits
+        return all(bits[i >> 3] & (1 << (i & 7)) for i in self._indexes(item))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, item) -> bool:
+        """添加元素，返回元素是否为新元素(可能存在误判，即新元素被判定为已存在)"""
+        bits, added = self.bits, False
+        for i in self._indexes(item):
+            mask = 1 << (i & 7)
+            if not bits[i >> 3] & mask:
+                bits[i >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def fill_ratio(self) -> float:
+        """位数组中被置位的比例"""
+        return sum(bin(byte).count("1") for byte in self.bits) / self.size
+
+    def sizeof(self) -> int:
+        """位数组的内存占用(字节)"""
+        return len(self.bits)
+
+
+class ScalableBloomFilter(object):
+    """可扩展的布隆过滤器
+
+    由一组容量按 growth 倍递增，误判率按 ratio 倍递减的布隆过滤器组成，当前过滤器达到容量后追加新的过滤器，
+    总体误判率不超过 error_rate / (1 - ratio)。内存占用随元素数量按对数级增长，当设置 max_filters 时，
+    达到上限后不再扩展(继续写入最后一个过滤器，误判率随之升高)，内存占用保持不变。
+
+    Attributes:
+        * capacity(int): 第一个过滤器的预期容量
+        * error_rate(float): 第一个过滤器的目标误判率
+        * growth(int): 容量增长倍数
+        * ratio(float): 误判率递减比例
+        * max_filters(int): 过滤器数量上限(None 表示不限制)
+        * filters(list): 布隆过滤器列表
+
+    Examples:
+        >>> bloom = ScalableBloomFilter(capacity=100, error_rate=0.01)
+        >>> sum(bloom.add(f"https://www.test.com/page/{i}") for i in range(1000)) > 990
+        True
+        >>> len(bloom.filters) > 1, "https://www.test.com/page/1" in bloom
+        (True, True)
+    """
+
+    def __init__(self, capacity:int, error_rate:float=0.001, growth:int=2, ratio:float=0.5, max_filters:int=None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.ratio = ratio
+        self.max_filters = max_filters
+        self.filters = [BloomFilter(capacity, error_rate * (1 - ratio))]
+
+    def __contains__(self, item) -> bool:
+        return any(item in bloom for bloom in reversed(self.filters))
+
+    def __len__(self) -> int:
+        return sum(bloom.count for bloom in self.filters)
+
+    def add(self, item) -> bool:
+        """添加元素，返回元素是否为新元素"""
+        if item in self:
+            return False
+        bloom = self.filters[-1]
+        if bloom.count >= bloom.capacity and (self.max_filters is None or len(self.filters) < self.max_filters):
+            bloom = BloomFilter(bloom.capacity * self.growth, bloom.error_rate * self.ratio)
+            self.filters.append(bloom)
+        return bloom.add(item)
+
+    def fill_ratio(self) -> float:
+        """最后一个过滤器的位数组中被置位的比例"""
+        return self.filters[-1].fill_ratio()
+
+    def sizeof(self) -> int:
+        """位数组的内存占用(字节)"""
+        return sum(bloom.sizeof() for bloom in self.filters)
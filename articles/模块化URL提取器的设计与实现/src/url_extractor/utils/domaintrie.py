@@ -0,0 +1,113 @@
+# Name: DomainTrie
+# Date: 2026-10-18
+# Author: Ais
+# Desc: 基于反向域名标签的前缀树(域名匹配)
+
+
+import re
+
+
+# URL的 scheme 前缀(scheme://)
+_SCHEME_PREFIX = re.compile(r'[A-Za-z][A-Za-z0-9+.\-]*://')
+
+# 节点标记: 精确匹配与通配符匹配
+_EXACT = 0
+_WILDCARD = 1
+
+
+def url_host(url:str) -> str:
+    """提取URL中的主机名
+
+    通过字符串查找与切片提取主机名(小写，不包含用户信息与端口)，不进行完整的URL解析。
+    只有位于URL开头或者紧跟在 scheme: 之后的 "//" 被视为主机名的起始位置，与 urllib.parse.urlparse 一致，
+    相对URL(如 "/go?to=http://www.test.com/")没有主机名。
+
+    Args:
+        * url(str): URL
+
+    Returns:
+        (str) 主机名，不存在时返回空字符串
+
+    Examples:
+        >>> url_host("https://user@WWW.Test.com:8080/page?a=1")
+        'www.test.com'
+        >>> url_host("//cdn.test.com/img.png"), url_host("/page/1")
+        ('cdn.test.com', '')
+        >>> url_host("http://[::1]:8080/")
+        '::1'
+        >>> url_host("/go?to=http://www.test.com/x"), url_host("1http://www.test.com/")
+        ('', '')
+    """
+    if url.startswith("//"):
+        start = 2
+    else:
+        match = _SCHEME_PREFIX.match(url)
+        if match is None:
+            return ""
+        start = match.end()
+    end = len(url)
+    for sep in "/?#":
+        i = url.find(sep, start, end)
+        if i >= 0:
+            end = i
+    at = url.rfind("@", start, end)
+    if at >= 0:
+        start = at + 1
+    if url.startswith("[", start):
+        i = url.find("]", start, end)
+        return url[start+1:i].lower() if i >= 0 else ""
+    colon = url.find(":", start, end)
+    if colon >= 0:
+        end = colon
+    return url[start:end].rstrip(".").lower()
+
+
+class DomainTrie(object):
+    """域名前缀树
+
+    将域名按标签反转后(如 www.test.com -> com, test, www)插入前缀树，匹配的复杂度为 O(标签数量)，与规则数量无关。
+    规则的格式:
+        * "www.test.com": 精确匹配该域名
+        * "*.test.com": 匹配 test.com 的任意子域名(不包括 test.com 本身)
+    匹配不区分端口，规则中的端口(如 "www.test.com:8080", "[::1]:8080")会被去除。
+
+    Examples:
+        >>> trie = DomainTrie(["www.test.com", "*.data.com", "www.port.com:8080"])
+        >>> [trie.match(host) for host in ("www.test.com", "test.com", "img.data.com", "a.b.data.com", "data.com", "www.port.com")]
+        [True, False, True, True, False, True]
+    """
+
+    def __init__(self, domains=()):
+        self.root = {}
+        for domain in domains:
+            self.add(domain)
+
+    def add(self, domain:str):
+        """添加域名规则"""
+        domain = domain.strip().lower()
+        # 去除端口(IPv6 地址需要使用方括号包裹)
+        if domain.startswith("["):
+            domain = domain[1:domain.find("]")] if "]" in domain else domain[1:]
+        elif domain.count(":") == 1:
+            domain = domain.partition(":")[0]
+        labels = domain.rstrip(".").split(".")
+        wildcard = labels[0] == "*"
+        if wildcard:
+            labels = labels[1:]
+        node = self.root
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+        node[_WILDCARD if wildcard else _EXACT] = True
+
+    def match(self, host:str) -> bool:
+        """判断主机名是否匹配域名规则"""
+        node = self.root
+        labels = host.split(".")
+        for i in range(len(labels) - 1, -1, -1):
+            node = node.get(labels[i])
+            if node is None:
+                return False
+            # 通配符规则要求至少还有一个子域名标签
+            if i and _WILDCARD in node:
+                return True
+        return _EXACT in node
@@ -0,0 +1,140 @@
+# Name: UrlFingerprint
+# Date: 2026-10-18
+# Author: Ais
+# Desc: URL规范化与定长(64位)指纹集合
+
+
+import bisect
+import hashlib
+from array import array
+from urllib.parse import urlsplit, urlunsplit
+
+
+# 默认端口
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url:str) -> str:
+    """URL规范化
+
+    将 scheme 与 host 转换为小写，去除默认端口与片段(#fragment)，空路径补全为 "/"，查询参数按键值排序(去除空参数)。
+    路径与查询参数保持原始编码(如 "%20" 与 "+" 不会互相转换，"?foo" 不会补全为 "?foo=")，
+    无法解析的URL(如 "http://[bad/", 端口无效)只去除首尾空白。
+
+    Args:
+        * url(str): URL
+
+    Returns:
+        (str) 规范化的URL
+
+    Examples:
+        >>> canonicalize_url("HTTPS://WWW.Test.com:443/page?b=2&a=1&a=0#top")
+        'https://www.test.com/page?a=0&a=1&b=2'
+        >>> canonicalize_url("http://www.test.com:8080")
+        'http://www.test.com:8080/'
+        >>> canonicalize_url("http://www.test.com/s?q=a%20b&foo&&k=a+b")
+        'http://www.test.com/s?foo&k=a+b&q=a%20b'
+        >>> canonicalize_url(" http://[bad/ ")
+        'http://[bad/'
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or "").rstrip(".")
+    if ":" in netloc:
+        # IPv6 地址
+        netloc = f'[{netloc}]'
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        netloc = f'{netloc}:{port}'
+    if parts.username is not None:
+        userinfo = parts.netloc.rpartition("@")[0]
+        netloc = f'{userinfo}@{netloc}'
+    # 按原始的 "键=值" 片段排序(保持参数的原始编码)
+    query = "&".join(sorted((param for param in parts.query.split("&") if param), key=lambda param: param.partition("=")[::2]))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+def url_fingerprint(url:str, canonicalize:bool=True) -> int:
+    """URL指纹
+
+    计算(规范化的)URL的 64 位指纹(blake2b 摘要)。
+
+    Args:
+        * url(str): URL
+        * canonicalize(bool): 是否预先进行URL规范化
+
+    Returns:
+        (int) 64 位无符号整数
+
+    Examples:
+        >>> url_fingerprint("https://www.test.com/page?a=1&b=2") == url_fingerprint("https://WWW.TEST.COM/page?b=2&a=1#top")
+        True
+    """
+    if canonicalize:
+        url = canonicalize_url(url)
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class FingerprintSet(object):
+    """指纹集合
+
+    保存 64 位指纹的集合，指纹存储在有序的 array('Q') 中(每个指纹 8 字节)，通过二分查找判断成员关系。
+    新插入的指纹先写入缓冲区(set)，当缓冲区的大小超过 max(buffer_size, len(self) // 64) 时批量合并到有序数组中，
+    合并时只对有序数组进行切片拼接，不会将已有指纹转换为 Python 对象，因此平均每个指纹的内存占用不超过 10 字节。
+
+    Attributes:
+        * buffer_size(int): 缓冲区的最小容量
+
+    Examples:
+        >>> fingerprints = FingerprintSet(buffer_size=2)
+        >>> [fingerprints.add(fp) for fp in (3, 1, 2, 3, 5, 1)]
+        [True, True, True, False, True, False]
+        >>> len(fingerprints), 2 in fingerprints, 4 in fingerprints
+        (4, True, False)
+    """
+
+    def __init__(self, buffer_size:int=65536):
+        self.buffer_size = buffer_size
+        # 有序指纹数组
+        self._sorted = array("Q")
+        # 缓冲区
+        self._buffer = set()
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._buffer)
+
+    def __contains__(self, fp:int) -> bool:
+        if fp in self._buffer:
+            return True
+        i = bisect.bisect_left(self._sorted, fp)
+        return i < len(self._sorted) and self._sorted[i] == fp
+
+    def add(self, fp:int) -> bool:
+        """添加指纹，返回指纹是否为新指纹"""
+        if fp in self:
+            return False
+        self._buffer.add(fp)
+        if len(self._buffer) > max(self.buffer_size, len(self._sorted) >> 6):
+            self.merge()
+        return True
+
+    def merge(self):
+        """将缓冲区合并到有序数组中"""
+        if not self._buffer:
+            return
+        merged, start = array("Q"), 0
+        for fp in sorted(self._buffer):
+            end = bisect.bisect_left(self._sorted, fp, start)
+            merged.extend(self._sorted[start:end])
+            merged.append(fp)
+            start = end
+        merged.extend(self._sorted[start:])
+        self._sorted, self._buffer = merged, set()
+
+    def sizeof(self) -> int:
+        """内存占用(字节，包含缓冲区中的整数对象)"""
+        return self._sorted.buffer_info()[1] * self._sorted.itemsize + len(self._buffer) * 64
@@ -4,7 +4,35 @@
 # Desc: 一种基于路径表达式的json数据提取器
 
 
+import os
 import re
+import sys
+import json
+import array
+import mmap
+import codecs
+import struct
+import hashlib
+import tempfile
+import operator
+import functools
+import collections
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
 
 
 class JsonPathExtractor(object):
@@ -15,18 +43,100 @@ class JsonPathExtractor(object):
 
     Attributes:
         * JSONPATH_SEP(static): 路径分隔符
-        * data(dict|list): 原始json数据
-        * index(dict): 路径索引表
+        * JSON_DECODER(static): 默认的 json 解码器，详见 get_decoder
+        * data(dict|list): 原始json数据(传入 bytes, bytearray, memoryview 时通过 decoder 解码)
+        * decoder(str|callable): json 解码器
+        * lazy(bool): 惰性模式，不预先构建路径索引表，按需遍历数据对象
+        * index_backend(str): 路径索引表的实现，可选的有 ["dict", "trie"]
+        * scope(list): 索引范围，只为指定路径前缀下的子树构建索引，其他路径按惰性模式处理
+        * max_depth(int): 索引深度，只为不超过该深度(路径段数量)的节点构建索引
+        * cache_size(int): 结果缓存的容量(LRU)，为 0 时不启用缓存
+        * hashing(bool): 构建路径索引表时同时计算所有对象和数组的子树哈希(Merkle 哈希)，用于 diff
+        * index(dict|JsonPathTrieIndex|JsonPathIndexFile): 路径索引表(惰性模式下首次访问时构建)
 
     Methods:
         * extract(static): 通过 jpath(路径表达式) 提取指定路径的单个值
+        * loads(static): 通过可配置的解码器解码 json 文本(支持 str, bytes, bytearray, memoryview)
+        * get_decoder(static): 获取 json 解码器
+        * compile(static): 将 jpath(路径表达式) 编译为提取函数(与 extract 语义一致)
+        * compile_map(static): 将 jpath_map(路径表达式映射表) 编译为提取函数(与 map 语义一致，不构建路径索引表)
+        * open(classmethod): 打开持久化的路径索引文件(内存映射)
+        * save_index: 将路径索引表持久化到文件
+        * close: 关闭通过 open 打开的路径索引文件
         * get: 通过 jpath(路径表达式) 提取指定路径的单个值
         * find: 通过 jpath(路径表达式) 提取指定路径模式(支持正则表达式)的值
+        * find_iter: find 的生成器版本
+        * find_values: 通过正则表达式匹配字符串叶子值，反向查找其路径
         * map: 通过指定 jpath_map(路径表达式映射表) 来提取多个指定路径的值
+        * columns: 按列提取对象数组中的多个字段
+        * set: 设置指定路径的值(增量更新路径索引表)
+        * delete: 删除指定路径的值(增量更新路径索引表)
+        * merge: 将数据深度合并到指定路径(增量更新路径索引表)
+        * subtree_hash: 指定路径的子树哈希
+        * diff: 对比两个数据对象，返回新增，删除以及变化的路径(跳过哈希相同的子树)
+        * index_size: 路径索引表的内存占用
+        * cache_info: 结果缓存的统计信息
+        * cache_clear: 清空结果缓存
     """
 
     # 路径分隔符
     JSONPATH_SEP = "/"
+    # 正则表达式元字符
+    JSONPATH_REGEX_META = set(".^$*+?{}[]\\|()")
+    # 默认的 json 解码器
+    JSON_DECODER = "auto"
+
+    @staticmethod
+    def get_decoder(decoder=None):
+        """获取 json 解码器
+
+        Args:
+            * decoder(str|callable): 解码器，可选的有 ["auto", "json", "orjson", "ujson"] 或者自定义的解码函数，
+                为空时使用 JsonPathExtractor.JSON_DECODER。auto 模式下依次选择已安装的 orjson, ujson，否则使用标准库 json。
+
+        Returns:
+            (function) 解码函数 loads(text)，支持 str, bytes, bytearray, memoryview
+
+        Examples:
+            >>> JsonPathExtractor.get_decoder("json")(memoryview(b'{"id": 1}'))
+            {'id': 1}
+        """
+        decoder = JsonPathExtractor.JSON_DECODER if decoder is None else decoder
+        if callable(decoder):
+            return decoder
+        if decoder == "auto":
+            decoder = "orjson" if orjson is not None else "ujson" if ujson is not None else "json"
+        if decoder not in ("json", "orjson", "ujson"):
+            raise ValueError(f'Unsupported decoder({decoder})')
+        if decoder == "orjson":
+            if orjson is None:
+                raise ImportError("orjson is required for decoder='orjson'")
+            # orjson 不支持 str 的子类(如 lxml 的 xpath 结果)
+            return lambda text: orjson.loads(str(text) if type(text) is not str and isinstance(text, str) else text)
+        if decoder == "ujson" and ujson is None:
+            raise ImportError("ujson is required for decoder='ujson'")
+        loads = json.loads if decoder == "json" else ujson.loads
+        # json 与 ujson 不支持 memoryview
+        return lambda text: loads(text.tobytes() if isinstance(text, memoryview) else text)
+
+    @staticmethod
+    def loads(text, decoder=None):
+        """解码 json 文本
+
+        直接解码 bytes 类型的文本(如 HTTP 响应体)，不需要先转换为 str。
+
+        Args:
+            * text(str|bytes|bytearray|memoryview): json 文本
+            * decoder(str|callable): 解码器，详见 get_decoder
+
+        Returns:
+            (any) json 数据对象
+
+        Examples:
+            >>> JsonPathExtractor.loads(b'{"data": {"type": "A"}}')
+            {'data': {'type': 'A'}}
+        """
+        return JsonPathExtractor.get_decoder(decoder)(text)
 
     @staticmethod
     def extract(data, jpath, default=None):
@@ -48,27 +158,260 @@ class JsonPathExtractor(object):
             >>> JsonPathExtractor.extract(test_data, "/data/type/name", default="test")
             'test'
         """
-        jpath = jpath.split(JsonPathExtractor.JSONPATH_SEP)[1:]
-        val = data
-        while jpath:
+        return JsonPathExtractor.compile(jpath)(data, default)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def compile(jpath):
+        """编译路径表达式(带缓存)
+
+        将 jpath(路径表达式) 预先拆分为键名序列，数组下标预先转换为整数，返回与 extract 语义一致的提取函数:
+        不包含数组下标的路径编译为连续的 item 查找(functools.reduce + operator.getitem)。
+
+        Args:
+            * jpath(str): 路径表达式
+
+        Returns:
+            (function) 提取函数 accessor(data, default=None)
+
+        Examples:
+            >>> accessor = JsonPathExtractor.compile("/data/list/1/source/url")
+            >>> accessor(test_data)
+            'http://www.test.com/data/A2'
+            >>> accessor({"data": {"list": []}}, default="-")
+            '-'
+            >>> JsonPathExtractor.compile("/data/list/1/source/url") is accessor
+            True
+        """
+        keys = []
+        for key in jpath.split(JsonPathExtractor.JSONPATH_SEP)[1:]:
             try:
-                key = int(jpath.pop(0)) if isinstance(val, (list, tuple)) else jpath.pop(0) 
-                val = val[key]
-            except: 
-                return default
-        return val
+                keys.append((key, int(key)))
+            except ValueError:
+                keys.append((key, None))
+        if all(index is None for key, index in keys):
+            keys = tuple(key for key, index in keys)
+            reduce, getitem = functools.reduce, operator.getitem
+
+            def accessor(data, default=None):
+                try:
+                    return reduce(getitem, keys, data)
+                except Exception:
+                    return default
+        else:
+            keys = tuple(keys)
+
+            def accessor(data, default=None):
+                val = data
+                try:
+                    for key, index in keys:
+                        val = val[index] if index is not None and isinstance(val, (list, tuple)) else val[key]
+                except Exception:
+                    return default
+                return val
+        return accessor
+
+    @staticmethod
+    def compile_map(jpath_map):
+        """编译路径表达式映射表
+
+        将 jpath_map(路径表达式映射表) 编译为提取函数，其结果与 JsonPathExtractor(data).map(jpath_map) 一致，
+        但不需要构建路径索引表: get 字段编译为预先解析键名的查找函数，所有 find 字段编译为一个组合路径匹配器(JsonPathMatcher)。
+        默认值均可哈希时按映射表的内容缓存编译结果。
+
+        Args:
+            * jpath_map(dict): 路径表达式映射表，详见 map
+
+        Returns:
+            (function) 提取函数 mapper(data)
+
+        Examples:
+            >>> mapper = JsonPathExtractor.compile_map({
+            ...    "pn": {"op": "get", "jpath": "/page/info/page_num"},
+            ...    "urls": {"op": "find", "jpath": "/data/list/\d+/source/url"}
+            ... })
+            >>> mapper(test_data)
+            {'pn': 1, 'urls': ['http://www.test.com/data/A1', 'http://www.test.com/data/A2', 'http://www.test.com/data/A3']}
+            >>> JsonPathExtractor.compile_map({"x": {"op": "find", "jpath": "/paths/text/html"}})({"paths": {"text/html": 1}})
+            {'x': [1]}
+        """
+        spec = tuple((field, jpath["op"].lower(), jpath["jpath"], jpath.get("default")) for field, jpath in jpath_map.items())
+        try:
+            return JsonPathExtractor._compile_map(spec)
+        except TypeError:
+            return JsonPathExtractor._compile_map.__wrapped__(spec)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _compile_map(spec):
+        """编译路径表达式映射表(spec 为 (字段名, 提取方式, 路径表达式, 默认值) 元组)"""
+        for field, op, jpath, default in spec:
+            if op not in ("get", "find"):
+                raise ValueError(f'Unsupported op({op})')
+        finds = tuple(jpath for field, op, jpath, default in spec if op == "find")
+        matcher = JsonPathMatcher.compile(finds)
+        getters = {field: _compile_get(jpath) for field, op, jpath, default in spec if op == "get"}
+
+        def mapper(data):
+            found = dict(zip(finds, matcher.findall(data))) if finds else {}
+            results = {}
+            for field, op, jpath, default in spec:
+                if op == "get":
+                    results[field] = getters[field](data, default)
+                else:
+                    results[field] = found[jpath] or default or []
+            return results
+        return mapper
 
-    def __init__(self, data):
-        # 原始数据
+    def __init__(self, data, lazy=False, index_backend="dict", scope=None, max_depth=None, cache_size=0, decoder=None, hashing=False):
+        if index_backend not in ("dict", "trie"):
+            raise ValueError(f'Unsupported index_backend({index_backend})')
+        # 惰性模式
+        self.lazy = lazy
+        # 路径索引表的实现
+        self.index_backend = index_backend
+        # 索引范围
+        self.scope = [scope] if isinstance(scope, str) else list(scope or [])
+        # 索引深度
+        self.max_depth = max_depth
+        # 结果缓存: 键为 (提取方式, 路径表达式, 默认值)
+        self.cache_size = cache_size
+        self._cache = collections.OrderedDict()
+        self._cache_hits = self._cache_misses = 0
+        # json 解码器
+        self.decoder = decoder
+        # 子树哈希
+        self.hashing = hashing
+        # 原始数据(同时构建路径索引表)
         self.data = data
+
+    @classmethod
+    def open(cls, path, cache_size=0):
+        """打开路径索引文件
+
+        通过内存映射打开 save_index 生成的路径索引文件，打开时不解码数据:
+        get 通过二分查找定位路径，find 对字面量前缀进行范围扫描，只解码匹配的值。
+        原始数据(data)在首次访问时才会完整解码，修改操作(set, delete, merge)会将索引加载到内存中。
+        索引文件限制了索引深度时，find 需要遍历超出索引深度的节点，此时会解码原始数据。
+
+        Args:
+            * path(str): 路径索引文件路径
+            * cache_size(int): 结果缓存的容量
+
+        Returns:
+            (JsonPathExtractor) 提取器，可作为上下文管理器使用，退出时关闭索引文件(详见 close)
+        """
+        index = JsonPathIndexFile(path)
+        extractor = cls(None, lazy=True, max_depth=index.max_depth, cache_size=cache_size)
+        extractor._data, extractor._index = _MISSING, index
+        return extractor
+
+    def close(self):
+        """关闭通过 open 打开的路径索引文件(释放内存映射与文件描述符)
+
+        关闭后未解码的原始数据与路径索引文件均不可再访问，已加载到内存中的索引与数据不受影响。
+        """
+        if isinstance(self._index, JsonPathIndexFile):
+            self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def save_index(self, path):
+        """持久化路径索引表
+
+        将原始数据的序列化结果与按路径排序的路径表(路径, 值的偏移量)写入文件，
+        通过 JsonPathExtractor.open 打开，详见 JsonPathIndexFile。
+
+        Args:
+            * path(str): 路径索引文件路径
+
+        Examples:
+            >>> import os, tempfile
+            >>> index_path = os.path.join(tempfile.mkdtemp(), "test_data.jpi")
+            >>> extractor.save_index(index_path)
+            >>> stored = JsonPathExtractor.open(index_path)
+            >>> stored.get("/data/list/1/source/url"), stored.find("/data/list/\d+/id")
+            ('http://www.test.com/data/A2', ['#A1', '#A2', '#A3'])
+            >>> stored.data == test_data
+            True
+            >>> stored.close()
+            >>> JsonPathExtractor(test_data, max_depth=2).save_index(index_path)
+            >>> with JsonPathExtractor.open(index_path) as stored:
+            ...     stored.find("/data/.*/url")
+            ['http://www.test.com/data/A1', 'http://www.test.com/data/A2', 'http://www.test.com/data/A3']
+        """
+        JsonPathIndexFile.save(path, self.data, self.max_depth)
+
+    @property
+    def data(self):
+        """原始数据(从路径索引文件打开时首次访问才解码)"""
+        if self._data is _MISSING:
+            self._data = self._index.load()
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        """替换原始数据，重建路径索引表并清空结果缓存
+
+        Examples:
+            >>> JsonPathExtractor(b'{"data": {"list": [{"id": "#A1"}]}}').find("/data/list/\d+/id")
+            ['#A1']
+        """
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = JsonPathExtractor.loads(data, self.decoder)
+        self._data = data
         # 路径索引表
-        self.index = self._build_jsonpath_index(val=data)
+        self._index = None if (self.lazy or self.scope) else self._build_index("", data)
+        # 子树索引表(惰性模式): 键为子树根路径，值为该子树的路径索引表
+        self._subtree_index = {}
+        # 路径索引表是否保持文档顺序(增量更新后可能被打乱)
+        self._ordered = True
+        # 字符串叶子值索引(首次使用时构建): {值: [(文档位置, 路径)]}
+        self._value_index = None
+        # 子树哈希表: {对象或数组的路径: 哈希值}
+        self._hashes = self._build_hashes() if self.hashing else None
+        for prefix in self.scope:
+            self._get_subtree_index(prefix)
+        self.cache_clear()
+
+    @property
+    def index(self):
+        """路径索引表
+
+        惰性模式下在首次访问时构建完整的路径索引表。
+        """
+        if self._index is None:
+            self._index = self._build_index("", self.data)
+            self._subtree_index.clear()
+            self._ordered = True
+        return self._index
+
+    def _build_index(self, prefix, val):
+        """构建以 prefix 为根路径的路径索引表
+
+        Args:
+            * prefix(str): 根路径
+            * val(any): 根路径对应的值
+
+        Returns:
+            (dict|JsonPathTrieIndex) 路径索引表
+        """
+        if self.index_backend == "trie":
+            return JsonPathTrieIndex(val, prefix, self.max_depth)
+        if not prefix:
+            return self._build_jsonpath_index(val=val)
+        path, _, key = prefix.rpartition(JsonPathExtractor.JSONPATH_SEP)
+        return self._build_jsonpath_index(path, key, val)
 
     def _build_jsonpath_index(self, path="", key=None, val=None, index=None):
         """构建路径索引表
 
-        通过递归遍历 json 数据对象，构建 **路径索引表**。
-        路径索引表的键由根节点到目标节点的路径构成。
+        通过显式栈先序遍历 json 数据对象(不受递归深度限制)，构建 **路径索引表**。
+        路径索引表的键由根节点到目标节点的路径构成，指定 max_depth 时只索引不超过该深度的节点。
 
         Args:
             * path(str): 路径前缀
@@ -81,17 +424,113 @@ class JsonPathExtractor(object):
         """
         index = {} if index is None else index
         jpath = (path + JsonPathExtractor.JSONPATH_SEP + str(key)) if key is not None else "" 
-        index[jpath] = val
-        if isinstance(val, dict):
-            [self._build_jsonpath_index(jpath, k, v, index) for k, v in val.items()]
-        elif isinstance(val, (list, tuple)):
-            [self._build_jsonpath_index(jpath, i, val[i], index) for i in range(len(val))]
-        else:
-            pass
+        index.update(_iter_jsonpath(val, jpath, self.max_depth))
+        return index
+
+    def _lookup(self, jpath):
+        """查找路径
+
+        优先查找路径索引表，路径索引表未构建或者路径超出索引深度时直接遍历数据对象。
+
+        Returns:
+            (tuple) (是否存在, 指定路径的值)
+        """
+        if self._index is None:
+            return self._resolve(jpath)
+        val = self._index.get(jpath, _MISSING)
+        if val is not _MISSING:
+            return True, val
+        if self.max_depth is not None and jpath.count(JsonPathExtractor.JSONPATH_SEP) > self.max_depth:
+            return self._resolve(jpath)
+        return False, None
+
+    def _resolve(self, jpath):
+        """解析路径
+
+        通过 jpath(路径表达式) 直接遍历数据对象，不依赖路径索引表。
+        其解析规则与路径索引表保持一致: 列表(元组)下标只接受规范的十进制整数(如 "1"，不接受 "01", "-1")，
+        按路径分隔符拆分查找失败时，继续查找键名包含路径分隔符的节点(如 "/paths/text/html" 指向 {"paths": {"text/html": 1}} 中的 1)。
+
+        Args:
+            * jpath(str): 路径表达式
+
+        Returns:
+            (tuple) (是否存在, 指定路径的值)
+
+        Examples:
+            >>> JsonPathExtractor({"paths": {"text/html": 1}}, lazy=True)._resolve("/paths/text/html")
+            (True, 1)
+        """
+        keys = jpath.split(JsonPathExtractor.JSONPATH_SEP)
+        if keys[0]:
+            return False, None
+        val = self.data
+        for key in keys[1:]:
+            exists, val = _get_child(val, key)
+            if not exists:
+                return _resolve_sep_key(self.data, jpath)
+        return True, val
+
+    def _literal_prefix(self, jpath):
+        """提取路径表达式的字面量前缀
+
+        路径表达式中(除最后一段外)不包含正则元字符的前导路径段，所有匹配项都位于该前缀指向的子树中。
+        当表达式不以路径分隔符开头或者包含选择分支(|)时，返回根路径。
+        前缀路径上的对象包含带有路径分隔符的键名时，匹配项可能位于其他子树中，前缀在该对象处截断。
+
+        Examples:
+            >>> extractor._literal_prefix("/data/list/\d+/source/url")
+            '/data/list'
+            >>> extractor._literal_prefix("/data/type")
+            '/data'
+            >>> extractor._literal_prefix("/data/list|/error")
+            ''
+            >>> JsonPathExtractor({"paths": {"text/html": 1}})._literal_prefix("/paths/text/.+")
+            '/paths'
+        """
+        keys = jpath.split(JsonPathExtractor.JSONPATH_SEP)
+        if keys[0] or "|" in jpath:
+            return ""
+        prefix, val = [], self.data
+        for key in keys[1:-1]:
+            if JsonPathExtractor.JSONPATH_REGEX_META.intersection(key) or _has_sep_key(val):
+                break
+            prefix.append(key)
+            exists, val = _get_child(val, key)
+            if not exists:
+                break
+        return "".join(JsonPathExtractor.JSONPATH_SEP + key for key in prefix)
+
+    def _get_subtree_index(self, prefix):
+        """获取子树索引表
+
+        惰性模式下只对查询涉及的子树构建索引，已构建的祖先子树索引会被复用。
+
+        Args:
+            * prefix(str): 子树根路径
+
+        Returns:
+            (dict) 子树的路径索引表
+        """
+        if self._index is not None or not prefix:
+            return self.index
+        for root, index in self._subtree_index.items():
+            if prefix == root or prefix.startswith(root + JsonPathExtractor.JSONPATH_SEP):
+                return index
+        exists, val = self._resolve(prefix)
+        if not exists:
+            return {}
+        # 移除被新子树覆盖的子树索引
+        for root in [root for root in self._subtree_index if root.startswith(prefix + JsonPathExtractor.JSONPATH_SEP)]:
+            del self._subtree_index[root]
+        index = self._subtree_index[prefix] = self._build_index(prefix, val)
         return index
 
     def __getitem__(self, jpath):
-        return self.index[jpath]
+        exists, val = self._lookup(jpath)
+        if not exists:
+            raise KeyError(jpath)
+        return val
 
     def get(self, jpath, default=None):
         """获取值
@@ -114,8 +553,31 @@ class JsonPathExtractor(object):
             'test'
             >>> extractor.get("/data/list/1")
             {'id': '#A2', 'name': 'A-2', 'source': {'url': 'http://www.test.com/data/A2', 'logo': './A2.png'}}
+            >>> JsonPathExtractor(test_data, lazy=True).get("/data/list/1/source/url")
+            'http://www.test.com/data/A2'
+            >>> [JsonPathExtractor({"paths": {"text/html": 1}}, **kwargs).get("/paths/text/html") for kwargs in ({}, {"lazy": True}, {"index_backend": "trie"})]
+            [1, 1, 1]
+            >>> scoped_extractor = JsonPathExtractor(test_data, scope=["/data/list"], max_depth=4)
+            >>> sorted(scoped_extractor._subtree_index["/data/list"])[:3]
+            ['/data/list', '/data/list/0', '/data/list/0/id']
+            >>> scoped_extractor.get("/data/list/2/source/logo"), scoped_extractor.get("/page/isEnd")
+            ('./A3.png', False)
         """
-        return self.index.get(jpath, default)
+        if not self.cache_size:
+            # 未启用结果缓存: 直接查找路径索引表
+            index = self._index
+            if index is not None and self.max_depth is None:
+                return index.get(jpath, default)
+            exists, val = self._lookup(jpath)
+            return val if exists else default
+        key = ("get", jpath, default)
+        hit, val = self._cache_get(key)
+        if hit:
+            return val
+        exists, val = self._lookup(jpath)
+        val = val if exists else default
+        self._cache_put(key, val)
+        return val
     
     def find(self, jpath, default=None):
         """查找值
@@ -123,7 +585,7 @@ class JsonPathExtractor(object):
         通过 jpath(路径表达式) 提取指定路径模式(支持正则表达式)的值，用于批量提取数据的场景。
 
         Args:
-            * jpath(str): 路径表达式(支持正则表达式)
+            * jpath(str|JsonPathPattern): 路径表达式(支持正则表达式)或者预编译的路径模式
             * default(any): 当该参数未指定时，默认返回空数组
         
         Returns:
@@ -136,13 +598,94 @@ class JsonPathExtractor(object):
             ['http://www.test.com/data/A1', 'http://www.test.com/data/A2', 'http://www.test.com/data/A3']
             >>> extractor.find("/data/list/\d+/source/name")
             []
+            >>> JsonPathExtractor(test_data, lazy=True).find("/data/list/\d+/id")
+            ['#A1', '#A2', '#A3']
+            >>> JsonPathExtractor({"paths": {"text/html": 1}}).find("/paths/text/html")
+            [1]
         """
-        return [val for path, val in self.index.items() if re.match(jpath, path)] or default or []
+        if not self.cache_size:
+            return list(self.find_iter(jpath)) or default or []
+        key = ("find", jpath.jpath if isinstance(jpath, JsonPathPattern) else jpath, default)
+        hit, val = self._cache_get(key)
+        if hit:
+            return list(val) if isinstance(val, list) else val
+        val = list(self.find_iter(jpath)) or default or []
+        self._cache_put(key, val)
+        return list(val) if isinstance(val, list) and self.cache_size else val
+
+    def find_iter(self, jpath):
+        """查找值(生成器)
+
+        按路径段逐段遍历数据对象进行匹配，只访问可能匹配的子树，
+        无法按路径段拆分的表达式回退到对路径索引表的正则匹配，详见 JsonPathPattern。
+        指定 max_depth 时路径索引表不包含更深的节点，回退模式直接遍历字面量前缀指向的子树。
+
+        Args:
+            * jpath(str|JsonPathPattern): 路径表达式(支持正则表达式)或者预编译的路径模式
+
+        Returns:
+            (generator) 目标数据
+
+        Examples:
+            >>> next(extractor.find_iter("/data/list/\d+/name"))
+            'A-1'
+            >>> list(extractor.find_iter("/data/list/.+/logo"))
+            ['./A1.png', './A2.png', './A3.png']
+            >>> list(JsonPathExtractor(test_data, max_depth=2).find_iter("/data/.*/url"))
+            ['http://www.test.com/data/A1', 'http://www.test.com/data/A2', 'http://www.test.com/data/A3']
+            >>> list(extractor.find_iter(JsonPathPattern.compile("/data/list/\d+/id")))
+            ['#A1', '#A2', '#A3']
+        """
+        pattern = jpath if isinstance(jpath, JsonPathPattern) else JsonPathPattern.compile(jpath)
+        jpath = pattern.jpath
+        if isinstance(self._index, JsonPathIndexFile) and self.max_depth is None:
+            return self._index.find_iter(pattern.regex)
+        if pattern.segments is not None:
+            return (val for path, val in pattern.finditer(self.data))
+        if self.max_depth is not None:
+            prefix = self._literal_prefix(jpath)
+            exists, val = self._resolve(prefix)
+            return (val for path, val in (_iter_jsonpath(val, prefix) if exists else ()) if pattern.match(path))
+        self._ensure_ordered()
+        index = self._get_subtree_index(self._literal_prefix(jpath)) if self._index is None else self._index
+        return (val for path, val in index.items() if pattern.match(path))
     
+    def find_values(self, pattern, indexed=False):
+        """反向查找值
+
+        遍历数据对象中的字符串叶子值，返回通过 pattern.search 匹配的 (路径, 值)，按文档顺序排列，
+        用于在结构未知的 json 数据中定位目标值(如URL)，不需要将数据重新序列化后进行正则匹配。
+
+        Args:
+            * pattern(str|re.Pattern): 正则表达式
+            * indexed(bool): 是否使用字符串叶子值索引，该索引在首次使用时构建(数据被修改后重建)，
+                相同的值只会被匹配一次，适用于重复查找的场景
+
+        Returns:
+            (list) [(路径, 值)]
+
+        Examples:
+            >>> extractor.find_values(r"^http://.+/A[12]$")
+            [('/data/list/0/source/url', 'http://www.test.com/data/A1'), ('/data/list/1/source/url', 'http://www.test.com/data/A2')]
+            >>> extractor.find_values(r"A3", indexed=True)
+            [('/data/list/2/id', '#A3'), ('/data/list/2/source/url', 'http://www.test.com/data/A3'), ('/data/list/2/source/logo', './A3.png')]
+        """
+        search = (re.compile(pattern) if isinstance(pattern, str) else pattern).search
+        if not indexed:
+            return [(path, val) for path, val in _iter_jsonpath(self.data) if isinstance(val, str) and search(val)]
+        if self._value_index is None:
+            self._value_index = {}
+            for pos, (path, val) in enumerate(_iter_jsonpath(self.data)):
+                if isinstance(val, str):
+                    self._value_index.setdefault(val, []).append((pos, path))
+        matches = sorted((pos, path, val) for val, entries in self._value_index.items() if search(val) for pos, path in entries)
+        return [(path, val) for pos, path, val in matches]
+
     def map(self, jpath_map):
         """映射值
 
         通过指定 jpath_map(路径表达式映射表) 来提取多个指定路径的值。
+        所有 find 字段被编译为一个组合路径匹配器(JsonPathMatcher)，通过单次遍历完成提取。
 
         Args:
             * jpath_map(dict): 路径表达式映射表, 其模式定义如下
@@ -165,11 +708,1717 @@ class JsonPathExtractor(object):
             >>> extractor.map(jpath_map)
             {'pn': 1, 'isEnd': False, 'urls': ['http://www.test.com/data/A1', 'http://www.test.com/data/A2', 'http://www.test.com/data/A3']}
         """
+        # 命中缓存的 find 字段不参与匹配
+        cached, finds = {}, []
+        for field, jpath in jpath_map.items():
+            if jpath["op"].lower() == "find":
+                hit, val = self._cache_get(("find", jpath["jpath"], jpath.get("default")))
+                if hit:
+                    cached[field] = list(val) if isinstance(val, list) else val
+                else:
+                    finds.append(jpath["jpath"])
+        if isinstance(self._index, JsonPathIndexFile):
+            found = {jpath: list(self.find_iter(jpath)) for jpath in finds}
+        else:
+            matcher = JsonPathMatcher.compile(tuple(finds))
+            found = dict(zip(finds, matcher.findall(self.data, self._get_fallback_index(matcher))))
+        results = {}
+        for field, jpath in jpath_map.items():
+            op, default = jpath["op"].lower(), jpath.get("default")
+            if op == "find":
+                if field in cached:
+                    results[field] = cached[field]
+                    continue
+                val = found[jpath["jpath"]] or default or []
+                self._cache_put(("find", jpath["jpath"], default), val)
+                results[field] = list(val) if isinstance(val, list) and self.cache_size else val
+            else:
+                results[field] = getattr(self, op)(jpath["jpath"], default=default)
+        return results
+
+    def columns(self, array_path, fields, default=None, output="list"):
+        """按列提取
+
+        单次遍历 array_path 指向的对象数组，按列提取每个元素中 fields 指定的字段，
+        用于替代对每个字段分别调用 find 后再按位置组合的场景。
+
+        Args:
+            * array_path(str): 对象数组的路径表达式
+            * fields(dict): 字段映射表，其模式定义如下
+                {
+                    "key": "subpath" | {"jpath": "subpath", "default": ""}
+                }
+                * subpath: 相对于数组元素的路径表达式
+                * default: 字段缺失时的默认值，未指定时使用 default 参数
+            * default(any): 默认值
+            * output(str): 列的输出格式，可选的有 ["list", "array", "numpy"]
+                * list: Python 列表
+                * array: 数值列(整数或浮点数)输出为 array.array，其他列输出为列表
+                * numpy: 输出为 numpy 数组(需要安装 numpy)，非数值列的 dtype 为 object
+
+        Returns:
+            (dict) 列数据 {字段名: 列}
+
+        Examples:
+            >>> extractor.columns("/data/list", {"id": "/id", "url": "/source/url", "size": {"jpath": "/source/size", "default": 0}})
+            {'id': ['#A1', '#A2', '#A3'], 'url': ['http://www.test.com/data/A1', 'http://www.test.com/data/A2', 'http://www.test.com/data/A3'], 'size': [0, 0, 0]}
+            >>> extractor.columns("/data/list", {"size": {"jpath": "/source/size", "default": 0}}, output="array")
+            {'size': array('q', [0, 0, 0])}
+        """
+        if output not in ("list", "array", "numpy"):
+            raise ValueError(f'Unsupported output({output})')
+        if output == "numpy" and numpy is None:
+            raise ImportError("numpy is required for output='numpy'")
+        sep = JsonPathExtractor.JSONPATH_SEP
+        # 字段列表: (字段名, 相对路径键名列表, 默认值)
+        specs = []
+        for field, subpath in fields.items():
+            field_default = default
+            if isinstance(subpath, dict):
+                subpath, field_default = subpath["jpath"], subpath.get("default", default)
+            keys = subpath.split(sep)
+            specs.append((field, keys[1:] if not keys[0] else None, field_default))
+        items = self.get(array_path)
+        items = items if isinstance(items, (list, tuple)) else []
+        columns = {field: [] for field, keys, field_default in specs}
+        for item in items:
+            for field, keys, field_default in specs:
+                exists, val = keys is not None, item
+                for key in keys or ():
+                    exists, val = _get_child(val, key)
+                    if not exists:
+                        break
+                columns[field].append(val if exists else field_default)
+        if output == "list":
+            return columns
+        return {field: self._to_column(values, output) for field, values in columns.items()}
+
+    def _to_column(self, values, output):
+        """将列表转换为 array.array 或者 numpy 数组"""
+        numeric = values and all(type(val) in (int, float) for val in values)
+        if output == "numpy":
+            return numpy.array(values) if numeric else numpy.array(values, dtype=object)
+        if not numeric:
+            return values
+        if all(type(val) is int for val in values):
+            try:
+                return array.array("q", values)
+            except OverflowError:
+                return values
+        return array.array("d", values)
+
+    def _get_fallback_index(self, matcher):
+        """获取组合路径匹配器回退模式所需的路径索引表(惰性模式下只构建公共前缀子树的索引)
+
+        指定 max_depth 时返回 None，回退模式直接遍历数据对象(路径索引表不包含超出索引深度的节点)。
+        """
+        if not matcher.fallbacks or self.max_depth is not None:
+            return None
+        self._ensure_ordered()
+        if self._index is not None:
+            return self._index
+        sep = JsonPathExtractor.JSONPATH_SEP
+        prefixes = [self._literal_prefix(matcher.patterns[i].jpath).split(sep) for i in matcher.fallbacks]
+        common = []
+        for keys in zip(*prefixes):
+            if len(set(keys)) != 1:
+                break
+            common.append(keys[0])
+        return self._get_subtree_index(sep.join(common))
+
+    def set(self, jpath, value):
+        """设置值
+
+        在原始数据上设置指定路径的值，并增量更新路径索引表(只重建被修改的子树)。
+        父节点必须存在，数组下标等于数组长度时追加元素，路径为根路径("")时替换整个数据对象。
+
+        Args:
+            * jpath(str): 路径表达式(不支持正则表达式)
+            * value(any): 值
+
+        Examples:
+            >>> page = JsonPathExtractor({"data": {"list": [{"id": "#A1"}]}})
+            >>> page.set("/data/list/1", {"id": "#A2"})
+            >>> page.set("/data/type", "A")
+            >>> page.find("/data/list/\d+/id"), page.get("/data/type")
+            (['#A1', '#A2'], 'A')
+            >>> page.set("/data/list/3", {"id": "#A4"})
+            Traceback (most recent call last):
+            ...
+            KeyError: '/data/list/3'
+        """
+        if not jpath:
+            self.data = value
+            return
+        path, key, parent = self._resolve_parent(jpath)
+        exists, _ = _get_child(parent, key)
+        if isinstance(parent, list):
+            if not exists and key != str(len(parent)):
+                raise KeyError(jpath)
+            mutate = (lambda: parent.__setitem__(int(key), value)) if exists else (lambda: parent.append(value))
+        else:
+            mutate = lambda: parent.__setitem__(key, value)
+        self._update(path, [key], mutate)
+
+    def delete(self, jpath):
+        """删除值
+
+        在原始数据上删除指定路径的值，并增量更新路径索引表。
+        删除数组元素时，其后的兄弟元素下标前移，只有这些元素的子树会被重建。
+
+        Args:
+            * jpath(str): 路径表达式(不支持正则表达式)
+
+        Examples:
+            >>> page = JsonPathExtractor({"data": {"list": [{"id": "#A1"}, {"id": "#A2"}], "type": "A"}})
+            >>> page.delete("/data/list/0")
+            >>> page.delete("/data/type")
+            >>> page.find("/data/list/\d+/id"), page.get("/data/type", "-")
+            (['#A2'], '-')
+        """
+        path, key, parent = self._resolve_parent(jpath)
+        exists, _ = _get_child(parent, key)
+        if not exists:
+            raise KeyError(jpath)
+        if isinstance(parent, list):
+            i = int(key)
+            self._update(path, [str(j) for j in range(i, len(parent))], lambda: parent.pop(i))
+        else:
+            self._update(path, [key], lambda: parent.pop(key))
+
+    def merge(self, prefix, data):
+        """合并数据
+
+        将 data 深度合并到 prefix 指向的节点，用于在单个提取器中汇总分页数据:
+            * 对象与对象: 按键名递归合并
+            * 数组与数组: 追加元素
+            * 其他情况: 替换原值(路径不存在时等价于 set)
+        每次合并只增量更新新增或者被替换的子树的路径索引。
+
+        Args:
+            * prefix(str): 合并的目标路径
+            * data(any): 待合并的数据
+
+        Examples:
+            >>> pages = JsonPathExtractor({"data": {"list": [{"id": "#A1"}]}, "page": 1})
+            >>> pages.merge("", {"data": {"list": [{"id": "#A2"}, {"id": "#A3"}]}, "page": 2})
+            >>> pages.find("/data/list/\d+/id"), pages.get("/page")
+            (['#A1', '#A2', '#A3'], 2)
+        """
+        sep = JsonPathExtractor.JSONPATH_SEP
+        stack = [(prefix, data)]
+        while stack:
+            prefix, data = stack.pop()
+            exists, target = self._resolve(prefix)
+            if exists and isinstance(target, dict) and isinstance(data, dict):
+                items = {}
+                for key, val in data.items():
+                    exists, child = _get_child(target, str(key))
+                    if exists and ((isinstance(child, dict) and isinstance(val, dict)) or (isinstance(child, list) and isinstance(val, (list, tuple)))):
+                        stack.append((prefix + sep + str(key), val))
+                    else:
+                        items[key] = val
+                if items:
+                    self._update(prefix, [str(key) for key in items], functools.partial(target.update, items))
+            elif exists and isinstance(target, list) and isinstance(data, (list, tuple)):
+                self._update(prefix, [str(i) for i in range(len(target), len(target) + len(data))], functools.partial(target.extend, data))
+            else:
+                self.set(prefix, data)
+
+    def _resolve_parent(self, jpath):
+        """解析路径的父节点
+
+        Returns:
+            (tuple) (父节点路径, 键名, 父节点)
+        """
+        path, sep, key = jpath.rpartition(JsonPathExtractor.JSONPATH_SEP)
+        exists, parent = self._resolve(path) if sep else (False, None)
+        if not exists or not isinstance(parent, (dict, list, tuple)):
+            raise KeyError(jpath)
+        if isinstance(parent, tuple):
+            raise TypeError(f'Immutable container({path}) does not support modification')
+        return path, key, parent
+
+    def _update(self, path, keys, mutate):
+        """修改原始数据并增量更新路径索引表
+
+        只有 path 指向节点下 keys 对应的子树会被更新: 字典实现移除旧子树的路径后添加新子树的路径，
+        前缀树实现重建 path 对应节点的子节点(未变化的子节点被复用)。
+        位于被修改子树内部的子树索引表将被丢弃(按需重建)。
+
+        Args:
+            * path(str): 被修改的节点路径
+            * keys(list): 发生变化的子节点键名列表
+            * mutate(callable): 修改原始数据的操作
+        """
+        sep = JsonPathExtractor.JSONPATH_SEP
+        if isinstance(self._index, JsonPathIndexFile):
+            self._index = self._build_index("", self.data)
+        paths = [path + sep + key for key in keys]
+        for root in [root for root in self._subtree_index if any(root == p or root.startswith(p + sep) for p in paths)]:
+            del self._subtree_index[root]
+        indexes = ([self._index] if self._index is not None else []) + [
+            index for root, index in self._subtree_index.items() if path == root or path.startswith(root + sep)
+        ]
+        depth = path.count(sep) + 1
+        indexed = self.max_depth is None or depth <= self.max_depth
+        tables = [index for index in indexes if not isinstance(index, JsonPathTrieIndex)] if indexed else []
+        if tables:
+            # 移除旧子树的后代路径(子树根路径保留原位置，以便替换叶子值时保持文档顺序)
+            olds = [(p, self._resolve(p)) for p in paths]
+            for p, (exists, val) in olds:
+                if exists:
+                    for child_path, _ in itertools.islice(_iter_jsonpath(val, p, self.max_depth), 1, None):
+                        for index in tables:
+                            index.pop(child_path, None)
+        mutate()
+        self._cache.clear()
+        self._value_index = self._hashes = None
+        for index in indexes:
+            if isinstance(index, JsonPathTrieIndex):
+                index.refresh(path)
+        if not tables:
+            return
+        for p, (existed, _) in olds:
+            exists, val = self._resolve(p)
+            if not exists:
+                for index in tables:
+                    index.pop(p, None)
+                continue
+            items = list(_iter_jsonpath(val, p, self.max_depth))
+            for index in tables:
+                index.update(items)
+            if not existed or len(items) > 1:
+                self._ordered = False
+
+    def _ensure_ordered(self):
+        """增量更新打乱了路径索引表的文档顺序时，重建路径索引表(用于回退模式的顺序扫描)"""
+        if self._ordered:
+            return
+        if self._index is not None:
+            self._index = self._build_index("", self.data)
+        self._subtree_index.clear()
+        for prefix in self.scope:
+            self._get_subtree_index(prefix)
+        self._ordered = True
+
+    def _build_hashes(self):
+        """计算子树哈希
+
+        通过显式栈后序遍历数据对象，为每个对象和数组计算 Merkle 哈希(blake2b):
+        对象的哈希由按键名排序的 (键名, 子节点) 计算(与键的顺序无关)，数组的哈希由按顺序排列的子节点计算，
+        其中子节点为对象或数组时取其哈希，为叶子值时取其字节表示(详见 _leaf_bytes)。
+
+        Returns:
+            (dict) {对象或数组的路径: 哈希值(bytes)}
+        """
+        sep, hashes = JsonPathExtractor.JSONPATH_SEP, {}
+        stack = [("", self.data, False)] if isinstance(self.data, (dict, list, tuple)) else []
+        while stack:
+            path, val, visited = stack.pop()
+            if not visited:
+                stack.append((path, val, True))
+                stack.extend((path + sep + key, child, False) for key, child in _iter_children(val) if isinstance(child, (dict, list, tuple)))
+                continue
+            h = hashlib.blake2b(b"d" if isinstance(val, dict) else b"l", digest_size=16)
+            children = _iter_children(val)
+            for key, child in (sorted(children, key=operator.itemgetter(0)) if isinstance(val, dict) else children):
+                encoded = key.encode("utf-8")
+                h.update(struct.pack("<I", len(encoded)) + encoded)
+                if isinstance(child, (dict, list, tuple)):
+                    h.update(b"#" + hashes[path + sep + key])
+                else:
+                    leaf = _leaf_bytes(child)
+                    h.update(b"=" + struct.pack("<I", len(leaf)) + leaf)
+            hashes[path] = h.digest()
+        return hashes
+
+    def _get_hashes(self):
+        if self._hashes is None:
+            self._hashes = self._build_hashes()
+        return self._hashes
+
+    def subtree_hash(self, jpath=""):
+        """子树哈希
+
+        Args:
+            * jpath(str): 路径表达式(不支持正则表达式)
+
+        Returns:
+            (str) 子树哈希的十六进制表示，路径不存在时返回 None
+
+        Examples:
+            >>> JsonPathExtractor({"a": 1, "b": [2]}).subtree_hash() == JsonPathExtractor({"b": [2], "a": 1}).subtree_hash()
+            True
+        """
+        exists, val = self._resolve(jpath)
+        if not exists:
+            return None
+        if isinstance(val, (dict, list, tuple)):
+            return self._get_hashes()[jpath].hex()
+        return hashlib.blake2b(_leaf_bytes(val), digest_size=16).hexdigest()
+
+    def diff(self, other):
+        """对比数据对象
+
+        以当前数据对象为基准，对比 other 中新增，删除以及变化的路径。
+        同时遍历两个数据对象，子树哈希相同的对象或数组被直接跳过，因此对比的开销与变化的规模成正比。
+        对象按键名对比，数组按下标对比; 新增或者删除的子树只返回其根路径，类型不同的节点视为变化。
+
+        Args:
+            * other(JsonPathExtractor|dict|list): 待对比的提取器或者数据对象
+
+        Returns:
+            (dict) {"added": 新增的路径列表, "removed": 删除的路径列表, "changed": 值发生变化的路径列表}
+
+        Examples:
+            >>> new_data = json.loads(json.dumps(test_data))
+            >>> new_data["data"]["list"][1]["source"]["url"] = "http://www.test.com/data/B2"
+            >>> new_data["data"]["list"].append({"id": "#A4"})
+            >>> del new_data["page"]["isEnd"]
+            >>> extractor.diff(new_data)
+            {'added': ['/data/list/3'], 'removed': ['/page/isEnd'], 'changed': ['/data/list/1/source/url']}
+        """
+        if not isinstance(other, JsonPathExtractor):
+            other = JsonPathExtractor(other, lazy=True)
+        sep = JsonPathExtractor.JSONPATH_SEP
+        hashes, other_hashes = self._get_hashes(), other._get_hashes()
+        added, removed, changed = [], [], []
+        stack = [("", self.data, other.data)]
+        while stack:
+            path, old, new = stack.pop()
+            if isinstance(old, (dict, list, tuple)) and isinstance(new, (dict, list, tuple)) and isinstance(old, dict) == isinstance(new, dict):
+                if hashes[path] == other_hashes[path]:
+                    continue
+                old_children, new_children = dict(_iter_children(old)), dict(_iter_children(new))
+                children = []
+                for key, child in old_children.items():
+                    if key in new_children:
+                        children.append((path + sep + key, child, new_children[key]))
+                    else:
+                        removed.append(path + sep + key)
+                added.extend(path + sep + key for key in new_children if key not in old_children)
+                stack.extend(reversed(children))
+            elif isinstance(old, (dict, list, tuple)) or isinstance(new, (dict, list, tuple)) or _leaf_bytes(old) != _leaf_bytes(new):
+                changed.append(path)
+        return {"added": added, "removed": removed, "changed": changed}
+
+    def _cache_get(self, key):
+        """查询结果缓存
+
+        Returns:
+            (tuple) (是否命中, 缓存值)
+        """
+        if not self.cache_size:
+            return False, None
+        try:
+            val = self._cache[key]
+        except KeyError:
+            self._cache_misses += 1
+            return False, None
+        except TypeError:
+            # 默认值不可哈希时不使用缓存
+            return False, None
+        self._cache.move_to_end(key)
+        self._cache_hits += 1
+        return True, val
+
+    def _cache_put(self, key, val):
+        """写入结果缓存，超出容量时淘汰最久未使用的缓存项"""
+        if not self.cache_size:
+            return
+        try:
+            self._cache[key] = val
+        except TypeError:
+            return
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def cache_info(self):
+        """结果缓存的统计信息
+
+        Returns:
+            (dict) {"hits": 命中次数, "misses": 未命中次数, "maxsize": 缓存容量, "currsize": 缓存项数量}
+
+        Examples:
+            >>> cached_extractor = JsonPathExtractor(test_data, cache_size=2)
+            >>> cached_extractor.find("/data/list/\d+/id") == cached_extractor.find("/data/list/\d+/id")
+            True
+            >>> cached_extractor.cache_info()
+            {'hits': 1, 'misses': 1, 'maxsize': 2, 'currsize': 1}
+            >>> cached_extractor.data = {"data": {"list": [{"id": "#B1"}]}}
+            >>> cached_extractor.find("/data/list/\d+/id"), cached_extractor.cache_info()["currsize"]
+            (['#B1'], 1)
+        """
+        return {"hits": self._cache_hits, "misses": self._cache_misses, "maxsize": self.cache_size, "currsize": len(self._cache)}
+
+    def cache_clear(self):
+        """清空结果缓存(包括统计信息)"""
+        self._cache.clear()
+        self._cache_hits = self._cache_misses = 0
+
+    def index_size(self):
+        """路径索引表的内存占用
+
+        统计路径索引表(包括惰性模式下的子树索引表)自身结构的内存占用，不包括与原始数据共享的值对象。
+
+        Returns:
+            (int) 内存占用(字节)
+
+        Examples:
+            >>> JsonPathExtractor(test_data, index_backend="trie").index_size() < extractor.index_size()
+            True
+            >>> JsonPathExtractor(test_data, lazy=True).index_size()
+            0
+        """
+        indexes = ([self._index] if self._index is not None else []) + list(self._subtree_index.values())
+        return sum(
+            index.sizeof() if isinstance(index, (JsonPathTrieIndex, JsonPathIndexFile)) else
+            sys.getsizeof(index) + sum(sys.getsizeof(path) for path in index)
+            for index in indexes
+        )
+
+
+class JsonPathTrieIndex(object):
+    """前缀共享的路径索引表
+
+    以路径段前缀树的形式保存路径索引，共享前缀的路径共享树节点，完整路径只在遍历时按需拼接:
+        * 只有对象和数组会构建树节点(采用 __slots__ 定义)，叶子值直接保存在父节点的子节点元组中。
+        * 对象节点的键名经过驻留(sys.intern)，具有相同键名序列的对象共享同一个 {键名: 下标} 映射表(shape)，
+          因此数组中同构的记录只需要为每个节点保存一个子节点元组。
+    其接口与字典实现的路径索引表保持一致(get, __getitem__, __contains__, items 等)，查找的时间复杂度为 O(路径深度)，
+    路径经过键名包含路径分隔符的对象时，需要逐个比较该对象的键名。
+
+    Attributes:
+        * prefix(str): 根路径
+        * root(JsonPathTrieIndex.Node|any): 根节点
+
+    Methods:
+        * get: 通过路径获取值
+        * items: 按文档顺序遍历 (路径, 值)
+        * refresh: 原始数据被修改后同步指定节点
+        * sizeof: 索引结构的内存占用
+
+    Examples:
+        >>> index = JsonPathTrieIndex(test_data)
+        >>> index["/data/list/0/id"]
+        '#A1'
+        >>> index.get("/data/list/01/id", "-")
+        '-'
+        >>> JsonPathTrieIndex({"paths": {"text/html": 1}}).get("/paths/text/html")
+        1
+        >>> list(JsonPathTrieIndex(test_data["page"], "/page").keys())
+        ['/page', '/page/info', '/page/info/page_num', '/page/info/page_size', '/page/info/total_page', '/page/isEnd']
+    """
+
+    class Node(object):
+        """前缀树节点"""
+
+        __slots__ = ("value", "shape", "children")
+
+        def __init__(self, value, shape, children):
+            # 节点值
+            self.value = value
+            # 对象节点的 {键名: 下标} 映射表(同构对象共享)，数组节点为 None
+            self.shape = shape
+            # 子节点元组(子节点为对象或数组时为树节点，否则为叶子值)
+            self.children = children
+
+    def __init__(self, data, prefix="", max_depth=None):
+        self.prefix = prefix
+        # 索引深度
+        self.max_depth = max_depth
+        # 对象键名序列的映射表缓存
+        self._shapes = {}
+        self.root = self._build(data)
+        self._size = None
+
+    def _node(self, val, depth):
+        """构建节点(子节点待填充)，达到索引深度的对象和数组作为叶子值保存"""
+        if self.max_depth is not None and depth >= self.max_depth:
+            return val
+        if isinstance(val, dict):
+            keys = tuple(sys.intern(key) if isinstance(key, str) else key for key in val)
+            shape = self._shapes.get(keys)
+            if shape is None:
+                shape = self._shapes[keys] = {key: i for i, key in enumerate(keys)}
+            return JsonPathTrieIndex.Node(val, shape, None)
+        if isinstance(val, (list, tuple)):
+            return JsonPathTrieIndex.Node(val, None, None)
+        return val
+
+    def _build(self, data, depth=None):
+        depth = self.prefix.count(JsonPathExtractor.JSONPATH_SEP) if depth is None else depth
+        root = self._node(data, depth)
+        stack = [(root, depth)] if isinstance(root, JsonPathTrieIndex.Node) else []
+        while stack:
+            node, depth = stack.pop()
+            val = node.value
+            node.children = tuple(self._node(child, depth + 1) for child in (val.values() if isinstance(val, dict) else val))
+            stack.extend((child, depth + 1) for child in node.children if isinstance(child, JsonPathTrieIndex.Node))
+        return root
+
+    def refresh(self, path):
+        """同步节点
+
+        原始数据中 path 指向的对象或数组被修改后，重建该节点的子节点:
+        值对象未变化的子节点(按对象标识判断)被复用，新增或者被替换的子节点重新构建。
+
+        Args:
+            * path(str): 被修改的节点路径
+        """
+        exists, node = self._find(path)
+        if not exists or not isinstance(node, JsonPathTrieIndex.Node):
+            return
+        Node, depth = JsonPathTrieIndex.Node, path.count(JsonPathExtractor.JSONPATH_SEP)
+        nodes = {id(child.value): child for child in node.children if isinstance(child, Node)}
+        node.shape = self._node(node.value, depth).shape
+        node.children = tuple(
+            nodes[id(child)] if id(child) in nodes else self._build(child, depth + 1)
+            for child in (node.value.values() if isinstance(node.value, dict) else node.value)
+        )
+        self._size = None
+
+    def _find(self, path):
+        """查找路径
+
+        Returns:
+            (tuple) (是否存在, 树节点或者叶子值)
+        """
+        if path == self.prefix:
+            return True, self.root
+        if not path.startswith(self.prefix + JsonPathExtractor.JSONPATH_SEP):
+            return False, None
+        node = self.root
+        for key in path[len(self.prefix)+1:].split(JsonPathExtractor.JSONPATH_SEP):
+            i = self._child_index(node, key)
+            if i is None:
+                return self._find_sep_key(path)
+            node = node.children[i]
+        return True, node
+
+    @staticmethod
+    def _child_index(node, key):
+        """子节点下标(不存在时返回 None)，数组下标只接受规范的十进制整数"""
+        if not isinstance(node, JsonPathTrieIndex.Node):
+            return None
+        if node.shape is not None:
+            return node.shape.get(key)
+        try:
+            i = int(key)
+        except ValueError:
+            return None
+        return i if str(i) == key and 0 <= i < len(node.children) else None
+
+    def _find_sep_key(self, path):
+        """查找经过键名包含路径分隔符的对象的路径(对象节点依次尝试由后续的 1~n 个路径段组成的键名)
+
+        Returns:
+            (tuple) (是否存在, 树节点或者叶子值)
+        """
+        sep = JsonPathExtractor.JSONPATH_SEP
+        keys = path[len(self.prefix)+1:].split(sep)
+        # 栈元素: (下一个待匹配的路径段下标, 树节点或者叶子值)
+        stack = [(0, self.root)]
+        while stack:
+            i, node = stack.pop()
+            if i == len(keys):
+                return True, node
+            if not isinstance(node, JsonPathTrieIndex.Node):
+                continue
+            if node.shape is not None:
+                children = []
+                for j in range(i + 1, len(keys) + 1):
+                    k = node.shape.get(sep.join(keys[i:j]))
+                    if k is not None:
+                        children.append((j, node.children[k]))
+                stack.extend(reversed(children))
+            else:
+                k = self._child_index(node, keys[i])
+                if k is not None:
+                    stack.append((i + 1, node.children[k]))
+        return False, None
+
+    def get(self, path, default=None):
+        exists, node = self._find(path)
+        if not exists:
+            return default
+        return node.value if isinstance(node, JsonPathTrieIndex.Node) else node
+
+    def __getitem__(self, path):
+        exists, node = self._find(path)
+        if not exists:
+            raise KeyError(path)
+        return node.value if isinstance(node, JsonPathTrieIndex.Node) else node
+
+    def __contains__(self, path):
+        return self._find(path)[0]
+
+    def __iter__(self):
+        return self.keys()
+
+    def __len__(self):
+        if self._size is None:
+            self._size = sum(1 for _ in self.items())
+        return self._size
+
+    def items(self):
+        """按文档顺序遍历 (路径, 值)"""
+        sep, Node = JsonPathExtractor.JSONPATH_SEP, JsonPathTrieIndex.Node
+        stack = [(self.prefix, self.root)]
+        while stack:
+            path, node = stack.pop()
+            if not isinstance(node, Node):
+                yield path, node
+                continue
+            yield path, node.value
+            keys = node.shape if node.shape is not None else range(len(node.children))
+            stack.extend(reversed([(path + sep + str(key), child) for key, child in zip(keys, node.children)]))
+
+    def keys(self):
+        return (path for path, val in self.items())
+
+    def values(self):
+        return (val for path, val in self.items())
+
+    def sizeof(self):
+        """索引结构的内存占用(字节)
+
+        统计树节点，子节点元组以及共享映射表的内存占用，驻留的键名字符串在所有节点间共享，不计入统计。
+        """
+        size = sys.getsizeof(self) + sys.getsizeof(self._shapes) + sum(sys.getsizeof(shape) for shape in self._shapes.values())
+        stack = [self.root] if isinstance(self.root, JsonPathTrieIndex.Node) else []
+        while stack:
+            node = stack.pop()
+            size += sys.getsizeof(node) + sys.getsizeof(node.children)
+            stack.extend(child for child in node.children if isinstance(child, JsonPathTrieIndex.Node))
+        return size
+
+
+class JsonPathIndexFile(object):
+    """持久化的路径索引表
+
+    路径索引文件由以下部分构成(整数均为小端序):
+        * 文件头: 魔数, 版本号, 路径数量, 路径表偏移量, 路径数据偏移量, 索引深度(-1 表示不限制)
+        * 文档: 原始数据的 json 序列化结果(utf-8)
+        * 路径数据: 所有路径(utf-8)按字节序排序后依次拼接
+        * 路径表: 每个路径一项 (路径偏移量, 路径长度, 值的偏移量, 值的长度)，与路径数据的排列顺序一致
+    打开文件时只读取文件头并建立内存映射: 查找路径通过对路径表的二分查找完成，
+    前缀查找通过对排序路径的范围扫描完成，只有命中的值会从文档中截取并解码。
+
+    Attributes:
+        * path(str): 文件路径
+        * max_depth(int): 索引深度
+
+    Methods:
+        * save(static): 将数据对象序列化并写入路径索引文件
+        * get: 通过路径获取值
+        * scan: 范围扫描指定前缀的路径
+        * find_iter: 查找匹配路径模式的值(范围扫描字面量前缀)
+        * items: 按文档顺序遍历 (路径, 值)
+        * load: 解码完整的数据对象
+        * close: 关闭文件
+
+    Examples:
+        >>> import os, tempfile
+        >>> index_path = os.path.join(tempfile.mkdtemp(), "page.jpi")
+        >>> JsonPathIndexFile.save(index_path, test_data["page"])
+        >>> index = JsonPathIndexFile(index_path)
+        >>> index.get("/info/page_num"), len(index)
+        (1, 6)
+        >>> [path for path, offset, length in index.scan("/info/page")]
+        ['/info/page_num', '/info/page_size']
+        >>> index.close()
+        >>> with JsonPathIndexFile(index_path) as index:
+        ...     index.get("/isEnd")
+        False
+    """
+
+    # 魔数
+    MAGIC = b"JPI1"
+    # 文件头: 魔数, 版本号, 路径数量, 路径表偏移量, 路径数据偏移量, 索引深度
+    HEADER = struct.Struct("<4sIQQQq")
+    # 路径表项: 路径偏移量, 路径长度, 值的偏移量, 值的长度
+    ENTRY = struct.Struct("<QIQQ")
+    VERSION = 1
+
+    @staticmethod
+    def save(path, data, max_depth=None):
+        """将数据对象序列化并写入路径索引文件
+
+        通过显式栈先序遍历数据对象并逐段写入其 json 序列化结果，同时记录每个路径对应的值在文档中的字节范围。
+
+        Args:
+            * path(str): 文件路径
+            * data(any): 数据对象
+            * max_depth(int): 索引深度
+        """
+        # 先写入同目录下的临时文件再替换目标文件: 已打开(内存映射)的旧文件不会被截断
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                JsonPathIndexFile._write(f, data, max_depth)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def _write(f, data, max_depth=None):
+        """将数据对象序列化并写入文件对象(详见 save)"""
+        sep, header = JsonPathExtractor.JSONPATH_SEP, JsonPathIndexFile.HEADER
+        dumps = functools.partial(json.dumps, ensure_ascii=False)
+        entries = []
+        f.write(bytes(header.size))
+        pos = header.size
+        # 栈元素: (路径, 值, 深度) 或者 (None, 待写入的文本, 闭合的路径项)
+        stack = [("", data, 0)]
+        while stack:
+            jpath, val, depth = stack.pop()
+            if jpath is None:
+                chunk = val.encode("utf-8")
+                f.write(chunk)
+                pos += len(chunk)
+                if depth is not None:
+                    depth[2] = pos - depth[1]
+                continue
+            entry = [jpath, pos, 0]
+            if max_depth is None or depth <= max_depth:
+                entries.append(entry)
+            if isinstance(val, (dict, list, tuple)) and (max_depth is None or depth < max_depth):
+                items = list(_iter_children(val))
+                opening, closing = ("{", "}") if isinstance(val, dict) else ("[", "]")
+                children = [(None, closing, entry)]
+                for i, (key, child) in enumerate(reversed(items)):
+                    children.append((jpath + sep + key, child, depth + 1))
+                    prefix = ("," if i < len(items) - 1 else "") + (dumps(key) + ":" if opening == "{" else "")
+                    if prefix:
+                        children.append((None, prefix, None))
+                stack.extend(children)
+                chunk = opening.encode("utf-8")
+            else:
+                chunk = dumps(val).encode("utf-8")
+                entry[2] = len(chunk)
+            f.write(chunk)
+            pos += len(chunk)
+        # 路径数据与路径表
+        entries = sorted((jpath.encode("utf-8"), offset, length) for jpath, offset, length in entries)
+        keys_offset = pos
+        for key, offset, length in entries:
+            f.write(key)
+        entries_offset, key_offset = keys_offset + sum(len(key) for key, offset, length in entries), keys_offset
+        for key, offset, length in entries:
+            f.write(JsonPathIndexFile.ENTRY.pack(key_offset, len(key), offset, length))
+            key_offset += len(key)
+        f.seek(0)
+        f.write(header.pack(JsonPathIndexFile.MAGIC, JsonPathIndexFile.VERSION, len(entries), entries_offset, keys_offset, -1 if max_depth is None else max_depth))
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count, self._entries_offset, self._doc_end, max_depth = JsonPathIndexFile.HEADER.unpack_from(self._mm)
+        if magic != JsonPathIndexFile.MAGIC or version != JsonPathIndexFile.VERSION:
+            self._mm.close()
+            raise ValueError(f'Invalid jsonpath index file({path})')
+        self.max_depth = None if max_depth < 0 else max_depth
+
+    def _entry(self, i):
+        """读取路径表项
+
+        Returns:
+            (tuple) (路径(bytes), 值的偏移量, 值的长度)
+        """
+        key_offset, key_length, offset, length = JsonPathIndexFile.ENTRY.unpack_from(self._mm, self._entries_offset + i * JsonPathIndexFile.ENTRY.size)
+        return self._mm[key_offset:key_offset+key_length], offset, length
+
+    def _bisect(self, key):
+        """二分查找第一个不小于 key 的路径表项下标"""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _decode(self, offset, length):
+        return json.loads(self._mm[offset:offset+length])
+
+    def get(self, path, default=None):
+        key = path.encode("utf-8")
+        i = self._bisect(key)
+        if i < self._count:
+            entry_key, offset, length = self._entry(i)
+            if entry_key == key:
+                return self._decode(offset, length)
+        return default
+
+    def __getitem__(self, path):
+        val = self.get(path, _MISSING)
+        if val is _MISSING:
+            raise KeyError(path)
+        return val
+
+    def __contains__(self, path):
+        key = path.encode("utf-8")
+        i = self._bisect(key)
+        return i < self._count and self._entry(i)[0] == key
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return self.keys()
+
+    def scan(self, prefix=""):
+        """范围扫描以 prefix(字符串前缀) 开头的路径，按路径的字节序返回 (路径, 值的偏移量, 值的长度)"""
+        key = prefix.encode("utf-8")
+        for i in range(self._bisect(key), self._count):
+            entry_key, offset, length = self._entry(i)
+            if not entry_key.startswith(key):
+                break
+            yield entry_key.decode("utf-8"), offset, length
+
+    @staticmethod
+    def _string_prefix(jpath):
+        """提取路径表达式的字面量字符串前缀(所有匹配路径的公共前缀)
+
+        Examples:
+            >>> JsonPathIndexFile._string_prefix("/data/list/1\d/id")
+            '/data/list/1'
+            >>> JsonPathIndexFile._string_prefix("/data/lists?/id")
+            '/data/list'
+        """
+        if "|" in jpath:
+            return ""
+        for i, c in enumerate(jpath):
+            if c in JsonPathExtractor.JSONPATH_REGEX_META:
+                # 量词作用于前一个字符
+                return jpath[:i-1] if c in "?*{" else jpath[:i]
+        return jpath
+
+    def find_iter(self, regex):
+        """查找值(生成器)
+
+        范围扫描以路径表达式的字面量前缀开头的路径，通过 regex.match 过滤后按值在文档中的位置(即文档顺序)解码返回。
+
+        Args:
+            * regex(re.Pattern): 路径表达式的正则对象
+        """
+        prefix = JsonPathIndexFile._string_prefix(regex.pattern)
+        matches = sorted((offset, length) for path, offset, length in self.scan(prefix) if regex.match(path))
+        return (self._decode(offset, length) for offset, length in matches)
+
+    def items(self):
+        """按文档顺序遍历 (路径, 值)"""
+        matches = sorted((offset, length, path) for path, offset, length in self.scan())
+        return ((path, self._decode(offset, length)) for offset, length, path in matches)
+
+    def keys(self):
+        return (path for path, offset, length in self.scan())
+
+    def values(self):
+        return (val for path, val in self.items())
+
+    def load(self):
+        """解码完整的数据对象"""
+        return self._decode(JsonPathIndexFile.HEADER.size, self._doc_end - JsonPathIndexFile.HEADER.size)
+
+    def sizeof(self):
+        """索引结构的内存占用(字节)，文件内容通过内存映射按需加载，不计入统计"""
+        return sys.getsizeof(self)
+
+    def close(self):
+        """关闭文件(释放内存映射)，可重复调用"""
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JsonPathPattern(object):
+    """路径模式
+
+    将 jpath(路径表达式) 按路径分隔符拆分为路径段，逐段遍历数据对象进行匹配:
+    字面量路径段直接查找子节点，正则路径段逐个过滤子节点，不可能匹配的子树将被跳过。
+    匹配结果与 re.match(jpath, path) 对路径索引表的匹配结果保持一致(包括前缀匹配语义以及文档顺序)。
+
+    当路径段可能匹配路径分隔符(如 ".", "[^...]", "\D")，或者包含跨路径段的语法(如顶层 "|"、前瞻、反向引用)时，
+    该表达式无法安全拆分，此时 segments 为 None，由调用方回退到逐路径的正则匹配。
+    遍历到包含路径分隔符的键名(如 "text/html")时，该子节点及其后代节点同样回退到对完整路径的正则匹配。
+
+    Attributes:
+        * jpath(str): 路径表达式
+        * regex(re.Pattern): 完整路径表达式的正则对象
+        * segments(list|None): 路径段匹配器列表，每一项为 (字面量, 正则对象)，其中之一为 None
+
+    Methods:
+        * compile(static): 构建路径模式(带缓存)
+        * match: 匹配完整路径
+        * step: 状态转移，逐层匹配子节点键名
+        * finditer: 逐段遍历数据对象，提取匹配的 (路径, 值)
+
+    Examples:
+        >>> JsonPathPattern("/data/list/\d+/id").segments is not None
+        True
+        >>> JsonPathPattern("/data/.*/url").segments is None
+        True
+        >>> [val for path, val in JsonPathPattern("/paths/text/html").finditer({"paths": {"text/html": 1, "text": {"html": 2}}})]
+        [1, 2]
+    """
+
+    # 匹配所有后代节点
+    ALL = -1
+    # 通过完整路径的正则匹配当前节点及其后代节点(键名包含路径分隔符)
+    REGEX = -2
+    # 安全的转义字符(不会匹配路径分隔符)
+    SAFE_ESCAPES = set("dwsbBZntrfva")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def compile(jpath):
+        """构建路径模式(带缓存)"""
+        return JsonPathPattern(jpath)
+
+    def __init__(self, jpath):
+        self.jpath = jpath
+        self.regex = re.compile(jpath)
+        self.segments = self._parse(jpath)
+
+    def _parse(self, jpath):
+        """拆分路径段
+
+        Returns:
+            (list|None) 路径段匹配器列表，表达式无法安全拆分时返回 None
+        """
+        sep = JsonPathExtractor.JSONPATH_SEP
+        keys = jpath.split(sep)
+        if keys[0] or len(keys) < 2:
+            return None
+        segments = []
+        for i, key in enumerate(keys[1:], 1):
+            if not self._is_safe_segment(key):
+                return None
+            last = i == len(keys) - 1
+            if not JsonPathExtractor.JSONPATH_REGEX_META.intersection(key):
+                segments.append((key, None))
+                continue
+            try:
+                # 中间路径段需完整匹配 "键名/"，末尾路径段只需前缀匹配
+                segments.append((None, re.compile(key if last else key + re.escape(sep))))
+            except re.error:
+                return None
+        return segments
+
+    def _is_safe_segment(self, segment):
+        """判断正则路径段是否可以独立匹配(不会匹配路径分隔符且不依赖相邻路径段)"""
+        sep = JsonPathExtractor.JSONPATH_SEP
+        if segment[:1] in ("*", "+", "?", "{"):
+            return False
+        i, n, depth = 0, len(segment), 0
+        while i < n:
+            c = segment[i]
+            if c == "\\":
+                e = segment[i+1:i+2]
+                if not e or (e.isalnum() and e not in self.SAFE_ESCAPES):
+                    return False
+                i += 2
+                continue
+            if c == "[":
+                j = i + 1
+                if segment[j:j+1] == "^":
+                    return False
+                members = []
+                if segment[j:j+1] == "]":
+                    members.append("]")
+                    j += 1
+                while j < n and segment[j] != "]":
+                    if segment[j] == "\\":
+                        e = segment[j+1:j+2]
+                        if not e or (e.isalnum() and e not in self.SAFE_ESCAPES):
+                            return False
+                        members.append(segment[j:j+2])
+                        j += 2
+                    else:
+                        members.append(segment[j])
+                        j += 1
+                if j >= n:
+                    return False
+                for k in range(1, len(members) - 1):
+                    if members[k] == "-":
+                        lo, hi = members[k-1], members[k+1]
+                        if len(lo) != 1 or len(hi) != 1 or lo <= sep <= hi:
+                            return False
+                i = j + 1
+                continue
+            if c in (".", "^"):
+                return False
+            if c == "(":
+                if segment[i+1:i+2] == "?" and segment[i+2:i+3] != ":":
+                    return False
+                depth += 1
+            elif c == ")":
+                depth -= 1
+            elif c == "|" and depth == 0:
+                return False
+            i += 1
+        return depth == 0
+
+    def match(self, path):
+        """匹配完整路径(与 re.match 语义一致)"""
+        return self.regex.match(path) is not None
+
+    def finditer(self, data):
+        """逐段遍历数据对象，提取匹配的 (路径, 值)
+
+        采用显式栈进行先序遍历，输出顺序与路径索引表的构建顺序一致。
+
+        Args:
+            * data(dict|list): json数据对象
+
+        Returns:
+            (generator) 匹配的 (路径, 值)
+
+        Examples:
+            >>> list(JsonPathPattern("/data/list/\d+/source/u").finditer(test_data))[0]
+            ('/data/list/0/source/url', 'http://www.test.com/data/A1')
+            >>> [path for path, val in JsonPathPattern("/data/list/1").finditer(test_data)][:2]
+            ['/data/list/1', '/data/list/1/id']
+        """
+        if self.segments is None:
+            return (item for item in _iter_jsonpath(data) if self.regex.match(item[0]))
+        return self._walk(data)
+
+    def step(self, state, key):
+        """状态转移
+
+        以 state 状态匹配子节点键名，用于在不构建路径字符串的情况下逐层匹配。
+        键名包含路径分隔符时无法逐层匹配，由调用方转移到 REGEX 状态(通过 match 匹配子节点及其后代节点的完整路径)。
+
+        Args:
+            * state(int): 当前状态(下一个待匹配的路径段下标，ALL 表示匹配所有后代节点)
+            * key(str): 子节点键名
+
+        Returns:
+            (tuple) (子节点是否匹配, 子节点的状态)，子节点的状态为 None 时表示其后代节点不可能匹配
+
+        Examples:
+            >>> pattern = JsonPathPattern("/data/list/\d+/id")
+            >>> pattern.step(2, "17")
+            (False, 3)
+            >>> pattern.step(3, "id")
+            (True, -1)
+        """
+        if state == self.ALL:
+            return True, self.ALL
+        literal, regex = self.segments[state]
+        if state < len(self.segments) - 1:
+            if literal is not None:
+                matched = key == literal
+            else:
+                matched = regex.fullmatch(key + JsonPathExtractor.JSONPATH_SEP) is not None
+            return False, (state + 1 if matched else None)
+        if literal is not None:
+            # 末尾字面量路径段: 前缀匹配的节点及其所有后代节点均匹配
+            return (True, self.ALL) if key.startswith(literal) else (False, None)
+        descendants = regex.match(key + JsonPathExtractor.JSONPATH_SEP) is not None
+        return regex.match(key) is not None, (self.ALL if descendants else None)
+
+    def _walk(self, data, path="", state=0):
+        sep = JsonPathExtractor.JSONPATH_SEP
+        segments, last, ALL, REGEX, match = self.segments, len(self.segments) - 1, self.ALL, self.REGEX, self.regex.match
+        # 栈元素: (路径, 值, 状态, 当前节点是否匹配)
+        stack = [(path, data, state, False)]
+        while stack:
+            path, val, state, matched = stack.pop()
+            if matched:
+                yield path, val
+            if state is None or not isinstance(val, (dict, list, tuple)):
+                continue
+            if state == ALL:
+                children = [(path + sep + key, child, ALL, True) for key, child in _iter_children(val)]
+            elif state == REGEX:
+                children = []
+                for key, child in _iter_children(val):
+                    child_path = path + sep + key
+                    children.append((child_path, child, REGEX, match(child_path) is not None))
+            elif state < last and segments[state][0] is not None and not _has_sep_key(val):
+                # 中间字面量路径段: 直接查找子节点
+                literal, children = segments[state][0], []
+                exists, child = _get_child(val, literal)
+                if exists:
+                    children.append((path + sep + literal, child, state + 1, False))
+            else:
+                children = []
+                for key, child in _iter_children(val):
+                    if sep in key:
+                        node, next_state = match(path + sep + key) is not None, REGEX
+                    else:
+                        node, next_state = self.step(state, key)
+                    if node or next_state is not None:
+                        children.append((path + sep + key, child, next_state, node))
+            stack.extend(reversed(children))
+
+
+# 缺省值标记
+_MISSING = object()
+
+
+def _iter_children(val):
+    """遍历子节点，返回 (键名, 子节点)"""
+    if isinstance(val, dict):
+        return ((str(key), child) for key, child in val.items())
+    return ((str(i), child) for i, child in enumerate(val))
+
+
+def _has_sep_key(val):
+    """判断对象是否包含带有路径分隔符的键名"""
+    if not isinstance(val, dict):
+        return False
+    try:
+        return JsonPathExtractor.JSONPATH_SEP in "".join(val)
+    except TypeError:
+        return any(JsonPathExtractor.JSONPATH_SEP in str(key) for key in val)
+
+
+def _get_child(val, key):
+    """通过键名查找子节点，列表(元组)下标只接受规范的十进制整数
+
+    Returns:
+        (tuple) (是否存在, 子节点)
+    """
+    if isinstance(val, dict):
+        return (True, val[key]) if key in val else (False, None)
+    if isinstance(val, (list, tuple)):
+        try:
+            i = int(key)
+        except ValueError:
+            return False, None
+        return (True, val[i]) if str(i) == key and 0 <= i < len(val) else (False, None)
+    return False, None
+
+
+def _resolve_sep_key(data, jpath):
+    """按完整路径查找值，用于路径经过键名包含路径分隔符的对象的场景
+
+    对象的键名依次尝试由后续的 1~n 个路径段组成的键名(如 "text", "text/html")，不需要遍历对象的所有键名。
+
+    Returns:
+        (tuple) (是否存在, 值)
+    """
+    sep = JsonPathExtractor.JSONPATH_SEP
+    keys = jpath.split(sep)
+    if keys[0]:
+        return False, None
+    keys, end = keys[1:], len(keys) - 1
+    # 栈元素: (下一个待匹配的路径段下标, 值)
+    stack = [(0, data)]
+    while stack:
+        i, val = stack.pop()
+        if i == end:
+            return True, val
+        if isinstance(val, dict):
+            children = []
+            for j in range(i + 1, end + 1):
+                key = sep.join(keys[i:j])
+                if key in val:
+                    children.append((j, val[key]))
+            stack.extend(reversed(children))
+        else:
+            exists, child = _get_child(val, keys[i])
+            if exists:
+                stack.append((i + 1, child))
+    return False, None
+
+
+def _leaf_bytes(val):
+    """叶子值的字节表示(用于计算子树哈希，带有类型标记以区分 "1", 1, 1.0 与 True)"""
+    if type(val) is str:
+        return b"s" + val.encode("utf-8", "surrogatepass")
+    return (type(val).__name__ + repr(val)).encode("utf-8", "backslashreplace")
+
+
+def _compile_get(jpath):
+    """编译路径表达式，返回与 JsonPathExtractor.get 语义一致(列表下标只接受规范的十进制整数)的查找函数 getter(data, default)"""
+    keys = jpath.split(JsonPathExtractor.JSONPATH_SEP)
+    if keys[0]:
+        return lambda data, default=None: default
+    steps = []
+    for key in keys[1:]:
+        try:
+            index = int(key)
+        except ValueError:
+            index = None
+        steps.append((key, index if index is not None and index >= 0 and str(index) == key else None))
+    steps = tuple(steps)
+
+    def missing(data, default):
+        # 查找失败: 路径可能经过键名包含路径分隔符的对象
+        exists, val = _resolve_sep_key(data, jpath)
+        return val if exists else default
+
+    def getter(data, default=None):
+        val = data
+        for key, index in steps:
+            if isinstance(val, dict):
+                if key not in val:
+                    return missing(data, default)
+                val = val[key]
+            elif isinstance(val, (list, tuple)):
+                if index is None or index >= len(val):
+                    return missing(data, default)
+                val = val[index]
+            else:
+                return missing(data, default)
+        return val
+    return getter
+
+
+def _iter_jsonpath(val, path="", max_depth=None):
+    """先序遍历数据对象，返回 (路径, 值)，其顺序与路径索引表一致
+
+    Args:
+        * val(any): 数据对象
+        * path(str): 数据对象的路径
+        * max_depth(int): 最大遍历深度(路径段数量)
+    """
+    sep = JsonPathExtractor.JSONPATH_SEP
+    stack = [(path, val, path.count(sep))]
+    while stack:
+        path, val, depth = stack.pop()
+        yield path, val
+        if isinstance(val, (dict, list, tuple)) and (max_depth is None or depth < max_depth):
+            stack.extend(reversed([(path + sep + key, child, depth + 1) for key, child in _iter_children(val)]))
+
+
+class JsonPathMatcher(object):
+    """组合路径匹配器
+
+    将多个 jpath(路径表达式) 编译为一棵路径段前缀树: 中间路径段按字面量(直接查找)和正则(逐个过滤子节点)分支，
+    末尾路径段作为终止匹配项挂载在对应的树节点上，共享前缀的表达式共享树节点。
+    通过单次遍历数据对象同时完成所有表达式的匹配，匹配结果与逐个调用 JsonPathPattern 保持一致。
+    无法按路径段拆分的表达式(回退模式)通过单次扫描路径索引表完成匹配，
+    键名包含路径分隔符的子树则通过对完整路径的正则匹配完成该子树中活跃表达式的匹配。
+
+    Attributes:
+        * patterns(list): 路径模式列表
+        * root(JsonPathMatcher.Node): 前缀树根节点
+        * fallbacks(list): 回退模式的表达式下标列表
+
+    Methods:
+        * compile(static): 构建组合路径匹配器(带缓存)
+        * findall: 单次遍历数据对象，提取每个表达式的匹配值
+
+    Examples:
+        >>> matcher = JsonPathMatcher(["/data/list/\d+/id", "/data/list/\d+/source/url", "/data/type"])
+        >>> matcher.findall(test_data)
+        [['#A1', '#A2', '#A3'], ['http://www.test.com/data/A1', 'http://www.test.com/data/A2', 'http://www.test.com/data/A3'], ['A']]
+        >>> JsonPathMatcher(["/paths/text/html", "/paths/\w+"]).findall({"paths": {"text/html": 1, "json": 2}})
+        [[1], [1, 2]]
+    """
+
+    class Node(object):
+        """前缀树节点"""
+
+        __slots__ = ("literals", "regexes", "terminals", "indexes")
+
+        def __init__(self):
+            # 字面量路径段分支: {字面量: 子节点}
+            self.literals = {}
+            # 正则路径段分支: {正则表达式: (正则对象, 子节点)}
+            self.regexes = {}
+            # 终止匹配项: [(表达式下标, 字面量, 正则对象)]
+            self.terminals = []
+            # 经过该节点的表达式下标列表
+            self.indexes = []
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def compile(jpaths):
+        """构建组合路径匹配器(带缓存)
+
+        Args:
+            * jpaths(tuple): 路径表达式元组
+        """
+        return JsonPathMatcher(jpaths)
+
+    def __init__(self, jpaths):
+        self.patterns = [JsonPathPattern.compile(jpath) for jpath in jpaths]
+        self.root = JsonPathMatcher.Node()
+        self.fallbacks = []
+        for i, pattern in enumerate(self.patterns):
+            if pattern.segments is None:
+                self.fallbacks.append(i)
+                continue
+            node = self.root
+            node.indexes.append(i)
+            for literal, regex in pattern.segments[:-1]:
+                if literal is not None:
+                    node = node.literals.setdefault(literal, JsonPathMatcher.Node())
+                else:
+                    node = node.regexes.setdefault(regex.pattern, (regex, JsonPathMatcher.Node()))[1]
+                node.indexes.append(i)
+            node.terminals.append((i, *pattern.segments[-1]))
+
+    def findall(self, data, index=None):
+        """单次遍历数据对象，提取每个表达式的匹配值
+
+        Args:
+            * data(dict|list): json数据对象
+            * index(dict): 路径索引表，用于回退模式的匹配，为空时遍历数据对象生成路径
+
+        Returns:
+            (list) 与 patterns 一一对应的匹配值列表
+        """
+        results = [[] for _ in self.patterns]
+        if len(self.fallbacks) < len(self.patterns):
+            self._walk(data, results)
+        if self.fallbacks:
+            items = index.items() if index is not None else _iter_jsonpath(data)
+            fallbacks = [(results[i], self.patterns[i].regex.match) for i in self.fallbacks]
+            for path, val in items:
+                for result, match in fallbacks:
+                    if match(path):
+                        result.append(val)
+        return results
+
+    def _walk(self, data, results):
+        sep = JsonPathExtractor.JSONPATH_SEP
+        # 栈元素: (路径, 值, 活跃的树节点列表, 匹配所有后代节点的表达式下标列表, 当前节点匹配的表达式下标列表, 完整路径匹配项列表)
+        stack = [("", data, [self.root], [], [], ())]
+        while stack:
+            path, val, nodes, alls, matched, regexes = stack.pop()
+            for i in matched:
+                results[i].append(val)
+            if regexes:
+                # 键名包含路径分隔符的子树: 通过完整路径的正则匹配
+                for p, v in _iter_jsonpath(val, path):
+                    for result, match in regexes:
+                        if match(p):
+                            result.append(v)
+            if not isinstance(val, (dict, list, tuple)) or not (nodes or alls):
+                continue
+            children = []
+            if not alls and not any(node.regexes or node.terminals for node in nodes) and not _has_sep_key(val):
+                # 只包含字面量分支: 直接查找子节点
+                branches = {}
+                for node in nodes:
+                    for literal, child_node in node.literals.items():
+                        branches.setdefault(literal, []).append(child_node)
+                for literal, child_nodes in branches.items():
+                    exists, child = _get_child(val, literal)
+                    if exists:
+                        children.append((path + sep + literal, child, child_nodes, [], [], ()))
+            else:
+                for key, child in _iter_children(val):
+                    if sep in key:
+                        # 键名包含路径分隔符: 该子树中活跃的表达式回退到完整路径的正则匹配
+                        child_regexes = [(results[i], self.patterns[i].regex.match) for node in nodes for i in node.indexes]
+                        children.append((path + sep + key, child, [], list(alls), list(alls), child_regexes))
+                        continue
+                    child_nodes, child_alls, child_matched = [], list(alls), list(alls)
+                    for node in nodes:
+                        if key in node.literals:
+                            child_nodes.append(node.literals[key])
+                        for regex, child_node in node.regexes.values():
+                            if regex.fullmatch(key + sep):
+                                child_nodes.append(child_node)
+                        for i, literal, regex in node.terminals:
+                            if literal is not None:
+                                if key.startswith(literal):
+                                    child_matched.append(i)
+                                    child_alls.append(i)
+                                continue
+                            if regex.match(key):
+                                child_matched.append(i)
+                            if regex.match(key + sep):
+                                child_alls.append(i)
+                    if child_nodes or child_alls or child_matched:
+                        children.append((path + sep + key, child, child_nodes, child_alls, child_matched, ()))
+            stack.extend(reversed(children))
+
+
+class JsonPathStreamExtractor(object):
+    """流式路径提取器
+
+    对原始json数据(字节串，文件对象或者数据块迭代器)进行单次流式解析，按照 jpath_map(路径表达式映射表) 提取多个字段，
+    不构建完整的数据对象: 只有匹配的节点才会被构建，与所有字段都无关的子树在解析时被直接跳过，
+    因此内存占用只取决于匹配节点的大小，而与数据总量无关。
+    当 jpath_map 中只包含 get 字段时，在所有字段解析完成后提前结束解析。
+
+    提取结果与 JsonPathExtractor(data).map(jpath_map) 保持一致。
+    该解析器不对json数据进行严格的格式校验。
+
+    Attributes:
+        * CHUNK_SIZE(static): 读取数据块的大小
+        * jpath_map(dict): 路径表达式映射表，详见 JsonPathExtractor.map
+
+    Methods:
+        * map: 从原始json数据中提取 jpath_map 指定的字段
+
+    Examples:
+        >>> stream_extractor = JsonPathStreamExtractor({
+        ...    "pn": {"op": "get", "jpath": "/page/info/page_num"},
+        ...    "isEnd": {"op": "get", "jpath": "/page/info/end?", "default": False},
+        ...    "urls": {"op": "find", "jpath": "/data/list/\\d+/source/url"}
+        ... })
+        >>> stream_extractor.map(json.dumps(test_data).encode())
+        {'pn': 1, 'isEnd': False, 'urls': ['http://www.test.com/data/A1', 'http://www.test.com/data/A2', 'http://www.test.com/data/A3']}
+        >>> raw = json.dumps(test_data).encode()
+        >>> JsonPathStreamExtractor({"type": {"op": "get", "jpath": "/data/type"}}).map(raw[i:i+16] for i in range(0, len(raw), 16))
+        {'type': 'A'}
+    """
+
+    # 读取数据块的大小
+    CHUNK_SIZE = 64 * 1024
+    # 词法单元
+    JSON_TOKEN = re.compile(r'''[ \t\n\r]*(?:([\[\]{}:,])|"([^"\\]*(?:\\.[^"\\]*)*)"|(-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?)|(true|false|null))''')
+    JSON_CONSTS = {"true": True, "false": False, "null": None}
+    # 回退模式(逐路径正则匹配)的状态
+    REGEX_STATE = "regex"
+
+    def __init__(self, jpath_map):
+        self.jpath_map = jpath_map
+        # 字段列表: (字段名, 提取方式, 路径键名列表|路径模式, 默认值)
+        self.fields = []
+        for field, jpath in jpath_map.items():
+            op = jpath["op"].lower()
+            if op == "get":
+                keys = jpath["jpath"].split(JsonPathExtractor.JSONPATH_SEP)
+                target = keys[1:] if not keys[0] else None
+            elif op == "find":
+                target = JsonPathPattern.compile(jpath["jpath"])
+            else:
+                raise ValueError(f'Unsupported op({jpath["op"]})')
+            self.fields.append((field, op, target, jpath.get("default")))
+
+    def map(self, source):
+        """映射值
+
+        Args:
+            * source(bytes|str|file|iterable): 原始json数据，可以是字节串，文件对象或者数据块(bytes|str)迭代器
+
+        Returns:
+            (dict) 目标数据
+        """
+        sep, ALL = JsonPathExtractor.JSONPATH_SEP, JsonPathPattern.ALL
+        results = [[] if op == "find" else _MISSING for field, op, target, default in self.fields]
+        # 待解析的 get 字段数量(用于提前结束解析)
+        pending = sum(1 for field, op, target, default in self.fields if op == "get" and target is not None)
+        early_exit = all(op == "get" for field, op, target, default in self.fields)
+        tokens = self._tokenize(source)
+        # 栈元素: [是否为对象, 路径, 活跃字段状态列表, 是否等待键名, 当前键名, 数组下标]
+        stack = []
+        root = [(i, self._initial_state(i)) for i in range(len(self.fields))]
+        for kind, val in tokens:
+            if kind == ",":
+                stack[-1][3] = stack[-1][0]
+                continue
+            if kind == ":":
+                continue
+            if kind == "}" or kind == "]":
+                stack.pop()
+                if not stack:
+                    break
+                continue
+            if stack:
+                frame = stack[-1]
+                if frame[0]:
+                    if frame[3]:
+                        frame[3], frame[4] = False, val
+                        continue
+                    key = frame[4]
+                else:
+                    key = str(frame[5])
+                    frame[5] += 1
+                path = frame[1] + sep + key
+                active = self._transit(frame[2], key, path)
+            else:
+                path, active = "", self._transit_root(root)
+            # active: [(字段下标, 子节点状态, 子节点是否匹配)]
+            if any([matched or state == ALL for i, state, matched in active]):
+                value = self._build(tokens, kind, val)
+                pending -= self._collect(results, active, path, value)
+                if early_exit and not pending:
+                    break
+            elif kind == "{" or kind == "[":
+                descending = [(i, state) for i, state, matched in active if state is not None]
+                if descending:
+                    stack.append([kind == "{", path, descending, kind == "{", None, 0])
+                else:
+                    self._skip(tokens)
+            if not stack:
+                break
         return {
-            field: getattr(self, jpath["op"].lower())(jpath["jpath"], default=jpath.get("default"))
-            for field, jpath in jpath_map.items()
+            field: (results[i] or default or []) if op == "find" else (default if results[i] is _MISSING else results[i])
+            for i, (field, op, target, default) in enumerate(self.fields)
         }
 
+    def _initial_state(self, i):
+        field, op, target, default = self.fields[i]
+        if op == "get":
+            return 0 if target is not None else None
+        return 0 if target.segments is not None else self.REGEX_STATE
+
+    def _transit_root(self, root):
+        """根节点的匹配状态"""
+        active = []
+        for i, state in root:
+            field, op, target, default = self.fields[i]
+            if state is None:
+                continue
+            if op == "get":
+                active.append((i, state, not target))
+            elif state == self.REGEX_STATE:
+                active.append((i, state, target.match("")))
+            else:
+                active.append((i, state, False))
+        return active
+
+    def _transit(self, states, key, path):
+        """子节点的匹配状态"""
+        active = []
+        for i, state in states:
+            field, op, target, default = self.fields[i]
+            if op == "get":
+                if target[state] == key:
+                    last = state + 1 == len(target)
+                    active.append((i, None if last else state + 1, last))
+                elif JsonPathExtractor.JSONPATH_SEP in key:
+                    # 键名包含路径分隔符: 一次匹配多个路径段
+                    keys = key.split(JsonPathExtractor.JSONPATH_SEP)
+                    if target[state:state+len(keys)] == keys:
+                        last = state + len(keys) == len(target)
+                        active.append((i, None if last else state + len(keys), last))
+            elif state == self.REGEX_STATE:
+                active.append((i, state, target.match(path)))
+            elif state != JsonPathPattern.ALL and JsonPathExtractor.JSONPATH_SEP in key:
+                # 键名包含路径分隔符: 回退到逐路径的正则匹配
+                active.append((i, self.REGEX_STATE, target.match(path)))
+            else:
+                matched, next_state = target.step(state, key)
+                if matched or next_state is not None:
+                    active.append((i, next_state, matched))
+        return active
+
+    def _collect(self, results, active, path, value):
+        """收集已构建节点(及其后代节点)的匹配结果
+
+        Returns:
+            (int) 新解析完成的 get 字段数量
+        """
+        resolved = 0
+        for i, state, matched in active:
+            field, op, target, default = self.fields[i]
+            if op == "get":
+                if matched:
+                    results[i], resolved = value, resolved + 1
+                    continue
+                exists, val = _resolve_sep_key(value, "".join(JsonPathExtractor.JSONPATH_SEP + key for key in target[state:]))
+                if exists:
+                    results[i], resolved = val, resolved + 1
+            elif state == self.REGEX_STATE:
+                results[i].extend(val for p, val in _iter_jsonpath(value, path) if target.match(p))
+            else:
+                if matched:
+                    results[i].append(value)
+                if state == JsonPathPattern.ALL:
+                    results[i].extend(val for p, val in itertools.islice(_iter_jsonpath(value, path), 1, None))
+                elif state is not None:
+                    results[i].extend(val for p, val in target._walk(value, path, state))
+        return resolved
+
+    def _chunks(self, source):
+        """将数据源转换为数据块迭代器"""
+        if isinstance(source, (bytes, bytearray, memoryview, str)):
+            view = memoryview(source) if not isinstance(source, str) else source
+            return (view[i:i+self.CHUNK_SIZE] for i in range(0, len(view), self.CHUNK_SIZE))
+        if hasattr(source, "read"):
+            return iter(lambda: source.read(self.CHUNK_SIZE), source.read(0))
+        return iter(source)
+
+    def _tokenize(self, source):
+        """词法分析(增量解码数据块)
+
+        Returns:
+            (generator) 词法单元 (类型, 值)，类型为标点符号，"s"(字符串) 或者 "v"(其他标量)
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        chunks = self._chunks(source)
+        match, consts = self.JSON_TOKEN.match, self.JSON_CONSTS
+        buf, pos, eof = "", 0, False
+        while True:
+            m = match(buf, pos)
+            # 数据块末尾的词法单元可能不完整(如数字)，需要读取后续数据块
+            if m is None or (m.lastindex == 3 and not eof and not buf[m.end():].strip("0123456789.eE+-")):
+                if eof:
+                    if buf[pos:].strip():
+                        raise ValueError(f'Invalid json data: {buf[pos:pos+32]!r}')
+                    return
+                chunk = next(chunks, None)
+                if chunk is None:
+                    eof, chunk = True, decoder.decode(b"", final=True)
+                elif not isinstance(chunk, str):
+                    chunk = decoder.decode(chunk)
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            pos, group = m.end(), m.lastindex
+            if group == 1:
+                yield m.group(1), None
+            elif group == 2:
+                string = m.group(2)
+                yield "s", json.loads(f'"{string}"') if "\\" in string else string
+            elif group == 3:
+                number = m.group(3)
+                yield "v", float(number) if ("." in number or "e" in number or "E" in number) else int(number)
+            else:
+                yield "v", consts[m.group(4)]
+
+    def _build(self, tokens, kind, val):
+        """构建以当前词法单元开始的节点"""
+        if kind != "{" and kind != "[":
+            return val
+        root = {} if kind == "{" else []
+        stack, key = [root], None
+        for kind, val in tokens:
+            if kind == "," or kind == ":":
+                continue
+            if kind == "}" or kind == "]":
+                stack.pop()
+                if not stack:
+                    return root
+                continue
+            top = stack[-1]
+            if key is None and isinstance(top, dict):
+                key = val
+                continue
+            child = {} if kind == "{" else [] if kind == "[" else val
+            if isinstance(top, dict):
+                top[key], key = child, None
+            else:
+                top.append(child)
+            if kind == "{" or kind == "[":
+                stack.append(child)
+        raise ValueError("Unexpected end of json data")
+
+    def _skip(self, tokens):
+        """跳过当前容器节点"""
+        depth = 1
+        for kind, val in tokens:
+            if kind == "{" or kind == "[":
+                depth += 1
+            elif kind == "}" or kind == "]":
+                depth -= 1
+                if not depth:
+                    return
+        raise ValueError("Unexpected end of json data")
+
 
 if __name__ ==  "__main__":
     